@@ -1,7 +1,9 @@
 import threading
+from collections import namedtuple
 from threading import RLock
 
 from mariadb.Cursor import Cursor
+from mariadb.PreparedStatement import PreparedStatement
 from mariadb.client.Client import Client
 from mariadb.client.Context import Context
 from mariadb.message.client.PingPacket import PingPacket
@@ -19,8 +21,17 @@ class Connection:
         self.lock = lock
         self.__client = client
 
-    def cursor(self) -> Cursor:
-        return Cursor(self.__client, self.lock)
+    def cursor(self, prefetch: bool = False, row_factory=None, named_tuple: bool = False,
+               dictionary: bool = False, raw: bool = False) -> Cursor:
+        if dictionary:
+            row_factory = dict
+        elif named_tuple:
+            row_factory = namedtuple
+        return Cursor(self.__client, self.lock, prefetch, row_factory, raw)
+
+    def prepare(self, sql: str, row_factory=None, raw: bool = False) -> PreparedStatement:
+        self.check_not_closed()
+        return PreparedStatement(self.__client, self.lock, sql, row_factory, raw)
 
     @property
     def autocommit(self) -> bool:
@@ -94,6 +105,18 @@ class Connection:
     def exception_factory(self) -> ExceptionFactory:
         return self.__client.exception_factory
 
+    def prepare_cache_stats(self) -> dict:
+        """
+        Prepare cache statistics: size, capacity, bytes, max_bytes, hits, misses, evictions and re_prepares
+        """
+        return self.__client.context.prepare_cache.stats()
+
+    def prepare_cache_hottest(self, limit: int = 10) -> list:
+        """
+        Most used cached statements, as (sql, hits) tuples
+        """
+        return self.__client.context.prepare_cache.hottest(limit)
+
     def thread_id(self) -> int:
         return self.__client.context.thread_id
 
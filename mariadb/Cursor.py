@@ -1,27 +1,51 @@
+import sys
+from collections import deque, namedtuple
 from threading import RLock
 
+from mariadb.SharedResult import share_rows
 from mariadb.client.Client import Client
 from mariadb.client.result.Result import Result
 from mariadb.message.client.BulkExecutePacket import BulkExecutePacket
 from mariadb.message.client.ExecutePacket import ExecutePacket
 from mariadb.message.client.PreparePacket import PreparePacket
 from mariadb.message.client.QueryPacket import QueryPacket
-from mariadb.message.client.QueryWithParametersPacket import QueryWithParametersPacket
+from mariadb.message.client.QueryWithParametersPacket import QueryWithParametersPacket, text_encodable
 from mariadb.message.server.OkPacket import OkPacket
 from mariadb.util.ClientParser import parameter_parts
 from mariadb.util.ExceptionFactory import ExceptionFactory
 from mariadb.util.constant import ServerStatus, Capabilities
 
 
+# minimum rows by prefetch batch, so background reading is not a thread handoff per row
+PREFETCH_MIN_ROWS = 100
+
+
 class Cursor:
 
-    def __init__(self, client: Client, lock: RLock):
+    __slots__ = ('__client', '__lock', '__closed', '__curr_result', '__results', '__arraysize', '__prefetch',
+                 '__fetch_size', '__prepare_threshold', '__execute_stmt_with_param', '__executemany', '__query_packet',
+                 '__execute_packet', 'prepare', 'row_factory', 'raw')
+
+    def __init__(self, client: Client, lock: RLock, prefetch: bool = False, row_factory=None, raw: bool = False):
         self.__client = client
         self.__lock = lock
         self.__closed = False
         self.__curr_result = None
         self.__results = None
         self.__arraysize = 1
+        # prefetch: result-sets are streamed by batches of arraysize rows (at least PREFETCH_MIN_ROWS),
+        # next batch being read in background
+        self.__prefetch = prefetch
+        self.__fetch_size = PREFETCH_MIN_ROWS if prefetch else 0
+        self.__prepare_threshold = client.conf.get("prepare_threshold")
+        # message objects reused by each execution
+        self.__query_packet = QueryPacket(None)
+        self.__execute_packet = ExecutePacket(None, None, None)
+        self.prepare = None
+        # row type: None (tuple), dict, collections.namedtuple or a class/callable taking values as arguments
+        self.row_factory = row_factory
+        # raw: values are not decoded, but returned as memoryview of row data (see Result.decode_raw)
+        self.raw = raw
         self.__execute_stmt_with_param = self.__execute_binary_stmt_with_param if client.conf.get(
             "use_binary") else self.__execute_text_stmt_with_param
 
@@ -36,7 +60,7 @@ class Cursor:
             self.__execute_stmt(sql)
         else:
             self.__execute_stmt_with_param(sql, parameters)
-        self.__curr_result = self.__results.pop(0)
+        self.__curr_result = self.__results.popleft()
 
     def close(self):
         if not self.__closed:
@@ -76,11 +100,60 @@ class Cursor:
             return self.__curr_result.fetchone()
         return None
 
+    def fetchmany(self, size: int = None) -> tuple:
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.fetchmany(self.__arraysize if size is None else size)
+        return None
+
     def fetchall(self) -> tuple:
         if isinstance(self.__curr_result, Result):
             return self.__curr_result.fetchall()
         return None
 
+    def fetchall_shared(self):
+        """
+        Fetch remaining rows into shared memory blocks, by column.
+        Rows must be tuples: not available for cursors with dict or custom row_factory, or raw cursors.
+        Requires python 3.8 (multiprocessing.shared_memory)
+        :return: picklable SharedResult descriptor, that worker processes can map without copy
+        """
+        if sys.version_info < (3, 8):
+            raise self.__exception_factory().create("fetchall_shared requires python 3.8")
+        if self.raw or self.row_factory not in (None, tuple, namedtuple):
+            raise self.__exception_factory().create(
+                "fetchall_shared requires tuple rows: not available with dict or custom row_factory, or raw cursor")
+        if isinstance(self.__curr_result, Result):
+            return share_rows(self.__curr_result.fetchall(), self.__curr_result.cols)
+        return None
+
+    def __iter__(self):
+        if isinstance(self.__curr_result, Result):
+            return iter(self.__curr_result)
+        return iter(())
+
+    def __next__(self) -> tuple:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    @property
+    def description(self) -> tuple:
+        """
+        DB-API result-set description, decoded on first access (None if no result-set)
+        """
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.description()
+        return None
+
+    def column_index(self, name: str) -> int:
+        """
+        Index of a current result-set column, by name
+        """
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.column_index(name)
+        raise self.__exception_factory().create("no result-set")
+
     @property
     def rowcount(self) -> int:
         if isinstance(self.__curr_result, OkPacket):
@@ -100,7 +173,7 @@ class Cursor:
             finally:
                 self.__lock.release()
         while len(self.__results) > 0:
-            self.__curr_result = self.__results.pop(0)
+            self.__curr_result = self.__results.popleft()
             if isinstance(self.__curr_result, Result):
                 return True
         self.__curr_result = None
@@ -116,6 +189,8 @@ class Cursor:
             raise self.__exception_factory().create("invalid fetch size")
 
         self.__arraysize = arraysize
+        if self.__prefetch:
+            self.__fetch_size = max(arraysize, PREFETCH_MIN_ROWS)
 
     def executemany(self, sql: str, batch_parameters):
         self.check_not_closed()
@@ -124,16 +199,16 @@ class Cursor:
             if len(batch_parameters[0]) > 0:
                 has_param = True
 
-        self.__results = []
+        self.__results = deque()
         self.__curr_result = None
         self.__lock.acquire()
         try:
             if not has_param:
                 for param in batch_parameters:
-                    self.__results.extend(self.__client.execute(QueryPacket(sql), self, self.__arraysize))
+                    self.__results.extend(self.__client.execute(QueryPacket(sql), self, self.__fetch_size))
             else:
                 self.__executemany(sql, batch_parameters)
-            self.__curr_result = self.__results.pop(0)
+            self.__curr_result = self.__results.popleft()
         finally:
             self.__lock.release()
 
@@ -144,7 +219,7 @@ class Cursor:
             if len(param) < parser.param_count:
                 raise Exception('some parameters are not set')
             self.__results = self.__client.execute(QueryWithParametersPacket(parser, param), self,
-                                                   self.__arraysize)
+                                                   self.__fetch_size)
 
     def __executemany_binary(self, sql: str, batch_parameters) -> None:
         self.prepare = self.__client.context.prepare_cache.get(sql)
@@ -157,11 +232,15 @@ class Cursor:
                 else:
                     statement_id = self.prepare.statement_id
                 msgs.append(BulkExecutePacket(statement_id, batch_parameters, sql))
-                self.__results = self.__client.execute_pipeline(msgs, self, self.__arraysize)
+                self.__results = self.__client.execute_pipeline(msgs, self, self.__fetch_size)
+
+                # bulk command bind its own parameter types
+                if self.prepare is not None:
+                    self.prepare.parameter_types = None
 
                 # remove prepare result
                 if statement_id == -1:
-                    self.__results.pop(0)
+                    self.__results.popleft()
             else:
                 # bulk disable, use pipelining
                 if not self.prepare:
@@ -171,22 +250,23 @@ class Cursor:
                     statement_id = self.prepare.statement_id
 
                 for params in batch_parameters:
-                    msgs.append(ExecutePacket(statement_id, params, sql))
-                self.__results = self.__client.execute_pipeline(msgs, self, self.__arraysize)
+                    msgs.append(ExecutePacket(statement_id, params, sql, self.prepare))
+                self.__results = self.__client.execute_pipeline(msgs, self, self.__fetch_size)
 
                 # remove prepare result
                 if statement_id == -1:
-                    self.__results.pop(0)
+                    self.__results.popleft()
         else:
             # pipelining not possible, just loop
 
             if not self.prepare:
-                self.prepare = self.__client.execute(PreparePacket(sql, self.__client), self, self.__arraysize)[0]
+                self.prepare = self.__client.execute(PreparePacket(sql, self.__client), self, self.__fetch_size)[0]
             statement_id = self.prepare.statement_id
 
-            res = []
+            res = deque()
             for params in batch_parameters:
-                res.append(self.__client.execute(ExecutePacket(statement_id, params, sql), self, self.__arraysize))
+                res.extend(self.__client.execute(ExecutePacket(statement_id, params, sql, self.prepare), self,
+                                                 self.__fetch_size))
             self.__results = res
 
     def setinputsizes(self, sizes) -> None:
@@ -199,7 +279,8 @@ class Cursor:
         self.check_not_closed()
         self.__lock.acquire()
         try:
-            self.__results = self.__client.execute(QueryPacket(sql), self, self.__arraysize)
+            self.__query_packet.sql = sql
+            self.__results = self.__client.execute(self.__query_packet, self, self.__fetch_size)
         finally:
             self.__lock.release()
 
@@ -214,7 +295,7 @@ class Cursor:
                 params = tuple(parameters)
             if len(params) < parser.param_count:
                 raise Exception('some parameters are not set')
-            self.__results = self.__client.execute(QueryWithParametersPacket(parser, params), self, self.__arraysize)
+            self.__results = self.__client.execute(QueryWithParametersPacket(parser, params), self, self.__fetch_size)
         finally:
             self.__lock.release()
 
@@ -227,23 +308,39 @@ class Cursor:
             params = parameters
             if type(parameters) != tuple:
                 params = tuple(parameters)
-            self.prepare = self.__client.context.prepare_cache.get(sql)
+            prepare_cache = self.__client.context.prepare_cache
+            if self.__prepare_threshold > 0 and text_encodable(params) and prepare_cache.peek(sql) is None \
+                    and self.__client.context.count_execution(sql) < self.__prepare_threshold:
+                # adaptive prepare: statement is not executed often enough to be worth preparing
+                self.prepare = None
+                self.__execute_text_stmt_with_param(sql, params)
+                return
+            self.prepare = prepare_cache.get(sql)
+
             if self.prepare:
                 if len(params) < self.prepare.num_params:
                     raise Exception('some parameters are not set')
 
-                self.__results = self.__client.execute(ExecutePacket(self.prepare.statement_id, params, sql), self,
-                                                       self.__arraysize)
+                packet = self.__execute_packet
+                packet.statement_id = self.prepare.statement_id
+                packet.parameters = params
+                packet.sql = sql
+                packet.prepare = self.prepare
+                self.__results = self.__client.execute(packet, self, self.__fetch_size)
             elif (self.__client.context.server_capabilities & Capabilities.MARIADB_CLIENT_STMT_BULK_OPERATIONS) > 0:
                 # pipelining only for MariaDB servers
                 msgs = [
                     PreparePacket(sql, self.__client),
                     ExecutePacket(-1, params, sql)
                 ]
-                self.__results = self.__client.execute_pipeline(msgs, self, self.__arraysize)
+                self.__results = self.__client.execute_pipeline(msgs, self, self.__fetch_size)
+
+                # remove prepare result
+                self.__results.popleft()
             else:
-                self.prepare = self.__client.execute(PreparePacket(sql, self.__client), self, self.__arraysize)[0]
-                self.__results = self.__client.execute(ExecutePacket(self.prepare, params, sql), self, self.__arraysize)
+                self.prepare = self.__client.execute(PreparePacket(sql, self.__client), self, self.__fetch_size)[0]
+                self.__results = self.__client.execute(
+                    ExecutePacket(self.prepare.statement_id, params, sql, self.prepare), self, self.__fetch_size)
         finally:
             self.__lock.release()
 
@@ -252,4 +349,4 @@ class Cursor:
             raise self.__client.exception_factory.create("Connection is closed", "08000", 1220)
 
     def update_meta(self, ci) -> None:
-        self.prepare.columns = ci
+        self.prepare.update_meta(ci)
@@ -0,0 +1,135 @@
+from threading import RLock
+
+from mariadb.client.Client import Client
+from mariadb.client.result.Result import Result
+from mariadb.message.client.BulkExecutePacket import BulkExecutePacket
+from mariadb.message.client.ExecutePacket import ExecutePacket
+from mariadb.message.client.PreparePacket import PreparePacket
+from mariadb.message.server.OkPacket import OkPacket
+from mariadb.util.constant import Capabilities
+
+
+class PreparedStatement:
+    """
+    Server prepared statement handle, bound to one SQL command.
+    Statement id, decoder plan and execute packet are kept for the handle lifetime, so
+    executions skip prepare cache lookup and per-call message construction.
+    The statement is not part of the prepare cache, and is closed on server with close().
+    """
+
+    __slots__ = ('__client', '__lock', '__sql', '__closed', '__curr_result', '__results', '__execute_packet',
+                 'prepare', 'row_factory', 'raw')
+
+    def __init__(self, client: Client, lock: RLock, sql: str, row_factory=None, raw: bool = False):
+        self.__client = client
+        self.__lock = lock
+        self.__sql = sql
+        self.__closed = False
+        self.__curr_result = None
+        self.__results = None
+        self.prepare = None
+        self.row_factory = row_factory
+        self.raw = raw
+
+        lock.acquire()
+        try:
+            client.execute(PreparePacket(sql, client, False), self)
+        finally:
+            lock.release()
+        self.__execute_packet = ExecutePacket(self.prepare.statement_id, None, sql, self.prepare)
+
+    @property
+    def sql(self) -> str:
+        return self.__sql
+
+    def execute(self, parameters=()) -> None:
+        self.check_not_closed()
+        params = parameters if type(parameters) is tuple else tuple(parameters)
+        if len(params) < self.prepare.num_params:
+            raise Exception('some parameters are not set')
+
+        self.__lock.acquire()
+        try:
+            self.__execute_packet.parameters = params
+            self.__results = self.__client.execute(self.__execute_packet, self)
+            self.__curr_result = self.__results.popleft()
+        finally:
+            self.__lock.release()
+
+    def executemany(self, batch_parameters) -> None:
+        self.check_not_closed()
+        batch_parameters = list(batch_parameters)
+        if not batch_parameters:
+            # nothing to execute
+            self.__results = None
+            self.__curr_result = None
+            return
+        self.__lock.acquire()
+        try:
+            if (self.__client.context.server_capabilities & Capabilities.MARIADB_CLIENT_STMT_BULK_OPERATIONS) > 0 \
+                    and self.__client.conf.get("use_bulk"):
+                self.__results = self.__client.execute(
+                    BulkExecutePacket(self.prepare.statement_id, batch_parameters, self.__sql), self)
+                # bulk command bind its own parameter types
+                self.prepare.parameter_types = None
+            else:
+                msgs = [ExecutePacket(self.prepare.statement_id, params, self.__sql, self.prepare)
+                        for params in batch_parameters]
+                self.__results = self.__client.execute_pipeline(msgs, self)
+            self.__curr_result = self.__results.popleft()
+        finally:
+            self.__lock.release()
+
+    def fetchone(self) -> tuple:
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.fetchone()
+        return None
+
+    def fetchmany(self, size: int = 1) -> tuple:
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.fetchmany(size)
+        return None
+
+    def fetchall(self) -> tuple:
+        if isinstance(self.__curr_result, Result):
+            return self.__curr_result.fetchall()
+        return None
+
+    @property
+    def rowcount(self) -> int:
+        if isinstance(self.__curr_result, OkPacket):
+            return self.__curr_result.affected_rows
+        return -1
+
+    def update_meta(self, ci) -> None:
+        self.prepare.update_meta(ci)
+
+    def check_not_closed(self) -> None:
+        if self.__closed:
+            raise self.__client.exception_factory.create("Prepared statement is closed", "08000", 1220)
+
+    def close(self) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__curr_result = None
+        self.__results = None
+        if self.prepare is not None and not self.__client.closed:
+            self.__lock.acquire()
+            try:
+                self.prepare.close(self.__client)
+            finally:
+                self.__lock.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        # finalizer may run in the middle of a command encoding: statement is only recorded,
+        # and closed on server with next command
+        if not self.__closed and self.prepare is not None and not self.__client.closed:
+            self.__closed = True
+            self.__client.release_prepare(self.prepare.statement_id)
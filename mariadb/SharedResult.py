@@ -0,0 +1,187 @@
+from array import array
+from itertools import accumulate
+
+from mariadb.client import DataTypeMap  # noqa: F401 (loaded before DataType, that depends on it)
+from mariadb.client.DataType import DataType
+
+INTEGER_TYPES = (DataType.TINYINT, DataType.SMALLINT, DataType.MEDIUMINT, DataType.INTEGER, DataType.BIGINT,
+                 DataType.YEAR)
+FLOAT_TYPES = (DataType.FLOAT, DataType.DOUBLE, DataType.DECIMAL, DataType.OLDDECIMAL)
+
+# column kinds: fixed width array typecodes, or variable length values
+KIND_STR = 'str'
+KIND_BYTES = 'bytes'
+
+
+class SharedResult:
+    """
+    Descriptor of a result-set stored by column in shared memory blocks.
+    Descriptor is small and picklable: worker processes map blocks by name, without copy.
+
+    Each column is one block, with one byte per row for null indicators, then either fixed width values
+    (typecode 'q', 'Q' or 'd'), or row_count + 1 offsets ('q') followed by utf-8 / binary data.
+    Values other than numbers, strings and bytes are stored as their string representation.
+    Creator must call unlink() when all processes have finished using the result.
+    """
+
+    __slots__ = ('row_count', 'columns', 'blocks')
+
+    def __init__(self, row_count: int, columns: tuple):
+        self.row_count = row_count
+        # (kind, block name) by column
+        self.columns = columns
+        self.blocks = {}
+
+    def __getstate__(self):
+        return self.row_count, self.columns
+
+    def __setstate__(self, state):
+        self.row_count, self.columns = state
+        self.blocks = {}
+
+    def block(self, index: int):
+        block = self.blocks.get(index)
+        if block is None:
+            block = attach(self.columns[index][1])
+            self.blocks[index] = block
+        return block
+
+    def nulls(self, index: int) -> memoryview:
+        return self.block(index).buf[0:self.row_count]
+
+    def column(self, index: int) -> memoryview:
+        """
+        Fixed width column values, as a typed memoryview (null values are 0).
+        For variable length columns, see offsets() and data()
+        """
+        kind = self.columns[index][0]
+        if kind == KIND_STR or kind == KIND_BYTES:
+            raise ValueError("column {} has variable length values".format(index))
+        start = data_start(self.row_count)
+        return self.block(index).buf[start:start + self.row_count * 8].cast(kind)
+
+    def offsets(self, index: int) -> memoryview:
+        start = data_start(self.row_count)
+        return self.block(index).buf[start:start + (self.row_count + 1) * 8].cast('q')
+
+    def data(self, index: int) -> memoryview:
+        start = data_start(self.row_count) + (self.row_count + 1) * 8
+        return self.block(index).buf[start:]
+
+    def value(self, row: int, index: int):
+        buf = self.block(index).buf
+        if buf[row]:
+            return None
+        kind = self.columns[index][0]
+        start = data_start(self.row_count)
+        if kind == KIND_STR or kind == KIND_BYTES:
+            offsets = buf[start:start + (self.row_count + 1) * 8].cast('q')
+            data_pos = start + (self.row_count + 1) * 8
+            value = buf[data_pos + offsets[row]:data_pos + offsets[row + 1]]
+            res = str(value, 'utf-8') if kind == KIND_STR else bytes(value)
+            value.release()
+            offsets.release()
+            return res
+        values = buf[start:start + self.row_count * 8].cast(kind)
+        res = values[row]
+        values.release()
+        return res
+
+    def rows(self):
+        column_count = len(self.columns)
+        for row in range(self.row_count):
+            yield tuple([self.value(row, index) for index in range(column_count)])
+
+    def close(self) -> None:
+        # views returned by column(), nulls(), offsets() and data() must be released before
+        for block in self.blocks.values():
+            block.close()
+        self.blocks.clear()
+
+    def unlink(self) -> None:
+        for index in range(len(self.columns)):
+            self.block(index).unlink()
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def data_start(row_count: int) -> int:
+    # values are 8 bytes aligned after null indicators
+    return (row_count + 7) & ~7
+
+
+def column_kind(column) -> str:
+    if column.data_type in INTEGER_TYPES:
+        return 'Q' if column.data_type == DataType.BIGINT and not column.is_signed() else 'q'
+    if column.data_type in FLOAT_TYPES:
+        return 'd'
+    if column.charset == 63 and column.data_type != DataType.JSON:
+        return KIND_BYTES
+    return KIND_STR
+
+
+def attach(name: str):
+    from multiprocessing import shared_memory
+    try:
+        # block is owned by creator, not by this process resource tracker
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before python 3.13, processes not started by fork must keep the creator alive until they exit
+        return shared_memory.SharedMemory(name=name)
+
+
+def share_rows(rows, columns: list) -> SharedResult:
+    """
+    Copy decoded rows into shared memory blocks, by column
+    :param rows: decoded rows
+    :param columns: result-set columns
+    :return: shared result descriptor
+    """
+    from multiprocessing import shared_memory
+
+    row_count = len(rows)
+    start = data_start(row_count)
+    descriptors = []
+    blocks = []
+    try:
+        for index, column in enumerate(columns):
+            kind = column_kind(column)
+            values = [row[index] for row in rows]
+            nulls = bytes([value is None for value in values])
+            if kind == KIND_STR or kind == KIND_BYTES:
+                encoded = [b'' if value is None else value.encode() if type(value) is str
+                           else bytes(value) if kind == KIND_BYTES else str(value).encode()
+                           for value in values]
+                offsets = array('q', [0])
+                offsets.extend(accumulate(map(len, encoded)))
+                data = b''.join(encoded)
+                size = start + len(offsets) * 8 + len(data)
+                block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                blocks.append(block)
+                buf = block.buf
+                buf[start:start + len(offsets) * 8] = offsets.tobytes()
+                buf[start + len(offsets) * 8:size] = data
+            else:
+                fixed = array(kind, [0 if value is None else value for value in values])
+                size = start + row_count * 8
+                block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                blocks.append(block)
+                buf = block.buf
+                buf[start:size] = fixed.tobytes()
+            buf[0:row_count] = nulls
+            descriptors.append((kind, block.name))
+    except Exception:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    res = SharedResult(row_count, tuple(descriptors))
+    for index, block in enumerate(blocks):
+        res.blocks[index] = block
+    return res
@@ -3,11 +3,18 @@ import threading
 from mariadb.Connection import Connection
 from mariadb.HostAddress import HostAddress
 from mariadb.client.Client import Client
+from mariadb.client.Converters import register_converter, unregister_converter
+from mariadb.client.DataType import DataType
+from mariadb.util.ExceptionFactory import SQLError
+from mariadb.util.NoLock import NoLock
 
 threadsafety = 1
 apilevel = "2.0"
 paramstyle = "qmark"
 
+# DB-API base exception name
+Error = SQLError
+
 
 def connect(**arg) -> Connection:
     conf = dict(arg)
@@ -33,11 +40,35 @@ def connect(**arg) -> Connection:
 
     conf.setdefault("database")
     conf.setdefault("prep_stmt_cache_size", 250)
+    conf.setdefault("prep_stmt_cache_max_bytes", 0)
+    # statements prepared when connecting (list or tuple), failures being logged
+    conf.setdefault("prepare_on_connect")
+    conf.setdefault("prepare_threshold", 0)
+    conf.setdefault("long_data_threshold", 64 * 1024)
+    conf.setdefault("long_data_chunk_size", 1024 * 1024)
+    # share equal ENUM, SET and short string values of a result (bounded by column, disables decode_processes)
+    conf.setdefault("intern_values", False)
+    conf.setdefault("intern_max_values", 1024)
+    # cache of parsed text protocol temporal values, by column (0: disabled)
+    conf.setdefault("temporal_cache_size", 0)
+    # binary column values returned as memoryview of a result arena, without copy of big packets
+    # (disables decode_processes)
+    conf.setdefault("result_arena", False)
+    # decode large result-sets in a process pool (0: disabled)
+    conf.setdefault("decode_processes", 0)
+    conf.setdefault("decode_chunk_rows", 10000)
+    # connection not shared between threads (single thread or asyncio owner): no locking
+    conf.setdefault("thread_safe", True)
     conf.setdefault("user")
     conf.setdefault("password")
     conf.setdefault("connection_attributes")
 
+    if conf.get("prepare_on_connect") is not None and type(conf.get("prepare_on_connect")) not in (list, tuple):
+        raise SQLError("prepare_on_connect must be a list or tuple of statements")
+    if type(conf.get("long_data_chunk_size")) is not int or conf.get("long_data_chunk_size") <= 0:
+        raise SQLError("long_data_chunk_size must be a positive integer")
+
     host_address = HostAddress(conf.get("host"), conf.get("port", 3306))
-    lock = threading.RLock()
+    lock = threading.RLock() if conf.get("thread_safe") else NoLock()
     client = Client(conf, host_address, lock)
     return Connection(conf, lock, client)
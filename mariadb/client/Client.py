@@ -1,6 +1,7 @@
 import logging
 import socket
 import struct
+from collections import deque
 from threading import RLock
 
 from mariadb.HostAddress import HostAddress
@@ -12,6 +13,7 @@ from mariadb.client.ReadAheadBufferedStream import ReadAheadBufferedStream
 from mariadb.message.ClientMessage import ClientMessage
 from mariadb.message.client.ClosePreparePacket import ClosePreparePacket
 from mariadb.message.client.HandshakeResponse import HandshakeResponse
+from mariadb.message.client.PreparePacket import PreparePacket, MAX_CACHED_SQL_LENGTH
 from mariadb.message.client.QuitPacket import QuitPacket
 from mariadb.message.server.ErrorPacket import ErrorPacket
 from mariadb.message.server.InitialHandshakePacket import InitialHandshakePacket
@@ -22,7 +24,8 @@ from mariadb.util.constant import Capabilities, ServerStatus
 class Client:
     logger = logging.getLogger(__name__)
     __slots__ = (
-    'sequence', 'lock', 'conf', 'host_address', 'closed', 'stream_cursor', 'stream_msg',
+    'sequence', 'lock', 'conf', 'host_address', 'closed', 'stream_cursor', 'stream_msg', 'stream_result',
+    'stream_results', 'pending_closes',
     'reader', 'writer', 'socket', 'exception_factory', 'disable_pipeline', 'context')
 
     def __init__(self, conf, host_address: HostAddress, lock: RLock):
@@ -31,8 +34,14 @@ class Client:
         self.conf = conf
         self.host_address = host_address
         self.closed = False
+        # streaming state belongs to this connection: only read/changed by the thread executing a command,
+        # under connection lock (or by the owning thread when not thread safe)
         self.stream_cursor = None
         self.stream_msg = None
+        self.stream_result = None
+        self.stream_results = None
+        # statement ids released by finalizers, closed on server with next command
+        self.pending_closes = []
         self.reader = None
         self.writer = None
         self.socket = None
@@ -67,7 +76,8 @@ class Client:
             self.exception_factory.thread_id = handshake.thread_id
             client_capabilities = self.initialize_client_capabilities(conf, handshake.capabilities)
             self.context = Context(handshake, client_capabilities, conf, self.exception_factory,
-                                   PrepareLruCache(self.conf.get('prep_stmt_cache_size')))
+                                   PrepareLruCache(self.conf.get('prep_stmt_cache_size'),
+                                                   self.conf.get('prep_stmt_cache_max_bytes'), lock))
 
             self.reader.set_server_thread_id(handshake.thread_id, host_address)
             self.writer.set_server_thread_id(handshake.thread_id, host_address)
@@ -128,12 +138,36 @@ class Client:
             # **********************************************************************
             # post queries
             # **********************************************************************
-            # TODO if needed
+            self.prepare_on_connect(conf)
 
         except Exception as err:
             self.destroy_socket()
             raise err
 
+    def prepare_on_connect(self, conf) -> None:
+        """
+        Prepare configured statements in one pipeline, filling prepare cache before first use.
+        Statements that cannot be cached (too long) are skipped, and failing statements are only logged:
+        they will be prepared again (and fail) on execution.
+        :param conf: configuration
+        """
+        statements = conf.get('prepare_on_connect')
+        if not statements or not conf.get('use_binary') or conf.get('prep_stmt_cache_size') <= 0:
+            return
+        messages = []
+        for sql in statements:
+            if len(sql) < MAX_CACHED_SQL_LENGTH:
+                messages.append(PreparePacket(sql, self))
+            else:
+                Client.logger.warning("prepare_on_connect statement not cached (too long): {}...".format(sql[0:64]))
+        try:
+            self.execute_pipeline(messages)
+        except SQLError as e:
+            if self.closed:
+                raise
+            # remaining statements have been prepared
+            Client.logger.warning("prepare_on_connect failed: {}".format(e))
+
     def connect_socket(self, conf: dict, host_address: HostAddress):
         if conf.get("pipe") is None and conf.get('local_socket') is None and host_address is None:
             raise ExceptionFactory.SQLError("hostname must be set to connect socket if not using local socket or pipe")
@@ -213,9 +247,11 @@ class Client:
             return server_language
         return 224
 
-    def execute_pipeline(self, messages: list, stmt=None, fetch_size: int = 0) -> list:
+    def execute_pipeline(self, messages: list, stmt=None, fetch_size: int = 0) -> deque:
         self.check_not_closed()
-        results = []
+        if self.pending_closes:
+            self.send_pending_closes()
+        results = deque()
         read_counter = 0
         response_msg = [0] * len(messages)
         try:
@@ -223,10 +259,15 @@ class Client:
                 for msg in messages:
                     results.extend(self.execute(msg, stmt, fetch_size))
             else:
-                for i, msg in enumerate(messages):
-                    if Client.logger.isEnabledFor(logging.DEBUG):
-                        Client.logger.debug("execute query: {}".format(msg.description()))
-                    response_msg[i] = msg.encode(self.writer, self.context)
+                # send all messages with one socket call
+                self.writer.cork()
+                try:
+                    for i, msg in enumerate(messages):
+                        if Client.logger.isEnabledFor(logging.DEBUG):
+                            Client.logger.debug("execute query: {}".format(msg.description()))
+                        response_msg[i] = msg.encode(self.writer, self.context)
+                finally:
+                    self.writer.uncork()
                 while read_counter < len(messages):
                     read_counter += 1
                     for j in range(response_msg[read_counter - 1]):
@@ -248,15 +289,17 @@ class Client:
                             pass
             raise
 
-    def execute(self, message: ClientMessage, cursor=None, fetch_size: int = 0) -> list:
+    def execute(self, message: ClientMessage, cursor=None, fetch_size: int = 0) -> deque:
         """
         Execute one command, and read response
         :param message: command to execute
         :param cursor: current cursor
         :param fetch_size: result-set size to read if streaming
-        :return: command response
+        :return: command responses, in order
         """
         self.check_not_closed()
+        if self.pending_closes:
+            self.send_pending_closes()
 
         if Client.logger.isEnabledFor(logging.DEBUG):
             Client.logger.debug("execute query: {}".format(message.description()))
@@ -267,10 +310,8 @@ class Client:
                 return self.read_response(message, cursor, fetch_size)
             else:
                 # Bulk Command that was too big, separate into multiple ones
-                if self.stream_cursor is not None:
-                    self.stream_cursor.fetchRemaining()
-                    self.stream_cursor = None
-                server_msgs = []
+                self.fetch_streaming()
+                server_msgs = deque()
                 while nb_resp > 0:
                     nb_resp -= 1
                     server_msgs.append(self.read_msg_result(cursor, message, fetch_size))
@@ -286,26 +327,56 @@ class Client:
             raise self.exception_factory.with_sql(message.description()).create("Socket error", "08000", sqle)
 
 
-    def read_response(self, message: ClientMessage, stmt=None, fetch_size: int = 0) -> list:
+    def read_response(self, message: ClientMessage, stmt=None, fetch_size: int = 0) -> deque:
         self.check_not_closed()
-        if self.stream_cursor is not None:
-            self.stream_cursor.fetchRemaining()
-            self.stream_cursor = None
-        server_msgs = []
-        server_msgs.append(self.read_msg_result(stmt, message, fetch_size))
-        while (self.context.server_status & ServerStatus.MORE_RESULTS_EXISTS) > 0:
+        self.fetch_streaming()
+        server_msgs = deque((self.read_msg_result(stmt, message, fetch_size),))
+        while self.stream_result is None and (self.context.server_status & ServerStatus.MORE_RESULTS_EXISTS) > 0:
             server_msgs.append(self.read_msg_result(stmt, message, fetch_size))
+        if self.stream_result is not None:
+            # following results will be added when streaming result is completely read
+            self.stream_results = server_msgs
         return server_msgs
 
 
     def close_prepare(self, prepare) -> None:
+        """
+        Close server prepared statement. Command has no response, so it is not sent immediately,
+        but with the next command
+        :param prepare: prepared statement
+        """
         self.check_not_closed()
+        deferred = self.writer.deferred
+        self.writer.deferred = True
         try:
             ClosePreparePacket(prepare.statement_id).encode(self.writer, self.context)
         except Exception as e:
             self.destroy_socket()
-            raise self.exception_factory.create("Socket error during post connection queries: " + e.getMessage(),
+            raise self.exception_factory.create("Socket error during post connection queries: " + str(e),
                                                 "08000", e)
+        finally:
+            self.writer.deferred = deferred
+
+    def release_prepare(self, statement_id: int) -> None:
+        """
+        Record a server prepared statement to close with next command, without writing anything.
+        Safe from a finalizer, that may run while a command is being encoded.
+        :param statement_id: server statement id
+        """
+        self.pending_closes.append(statement_id)
+
+    def send_pending_closes(self) -> None:
+        deferred = self.writer.deferred
+        self.writer.deferred = True
+        try:
+            while self.pending_closes:
+                ClosePreparePacket(self.pending_closes.pop()).encode(self.writer, self.context)
+        except Exception as e:
+            self.destroy_socket()
+            raise self.exception_factory.create("Socket error during post connection queries: " + str(e),
+                                                "08000", e)
+        finally:
+            self.writer.deferred = deferred
 
     def read_streaming_results(self, cursor_result):
         """
@@ -315,9 +386,23 @@ class Client:
         :return:
         """
         if self.stream_cursor is not None:
-            cursor_result.append(self.read_msg_result(self.stream_cursor, self.stream_msg, 0))
+            stream_cursor = self.stream_cursor
+            stream_msg = self.stream_msg
+            self.stream_cursor = None
+            self.stream_msg = None
+            self.stream_result = None
+            self.stream_results = None
             while (self.context.server_status & ServerStatus.MORE_RESULTS_EXISTS) > 0:
-                cursor_result.append(self.read_msg_result(self.stream_cursor, self.stream_msg, 0))
+                cursor_result.append(self.read_msg_result(stream_cursor, stream_msg, 0))
+
+    def fetch_streaming(self) -> None:
+        """
+        If last command was a streaming result-set not completely read, load remaining rows and following results,
+        so next response can be read
+        """
+        if self.stream_result is not None:
+            self.stream_result.fetch_remaining()
+            self.read_streaming_results(self.stream_results)
 
     def read_msg_result(self, cursor, message: ClientMessage, fetch_size: int):
         """
@@ -337,6 +422,7 @@ class Client:
         if server_msg.streaming():
             self.stream_cursor = cursor
             self.stream_msg = message
+            self.stream_result = server_msg
         return server_msg
 
     def destroy_socket(self) -> None:
@@ -359,6 +445,11 @@ class Client:
         try:
             if not self.closed:
                 self.closed = True
+            if self.stream_result is not None:
+                # stop prefetch thread of a result not completely read
+                self.stream_result.abort()
+                self.stream_result = None
+                self.stream_results = None
             try:
                 quit_packet = QuitPacket()
                 quit_packet.encode(self.writer, self.context)
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from ..message.server.InitialHandshakePacket import InitialHandshakePacket
 from ..util.ExceptionFactory import ExceptionFactory
 from ..util.constant import Capabilities
@@ -7,7 +9,8 @@ class Context:
 
     __slots__ = (
         'thread_id', 'seed', 'server_capabilities', 'server_status', 'version', 'eof_deprecated', 'skip_meta', 'extended_info',
-        'conf', 'state_flag', 'database', 'exception_factory', 'transaction_isolation_level', 'prepare_cache')
+        'conf', 'state_flag', 'database', 'exception_factory', 'transaction_isolation_level', 'prepare_cache',
+        'execution_counts', 'execution_counts_size')
     
     def __init__(self, handshake: InitialHandshakePacket, client_capabilities: int, conf,
                  exception_factory: ExceptionFactory, prepare_cache):
@@ -25,11 +28,20 @@ class Context:
         self.exception_factory = exception_factory
         self.transaction_isolation_level = None
         self.prepare_cache = prepare_cache
-        # self.prepare_cache = prepare_cache
+        # execution count of not prepared statements, bounded to a few times the prepare cache size
+        self.execution_counts = OrderedDict()
+        self.execution_counts_size = conf.get('prep_stmt_cache_size') * 4
 
     def reset_prepare_cache(self):
         self.prepare_cache.reset()
 
+    def count_execution(self, sql: str) -> int:
+        count = self.execution_counts.pop(sql, 0) + 1
+        self.execution_counts[sql] = count
+        if len(self.execution_counts) > self.execution_counts_size:
+            self.execution_counts.popitem(last=False)
+        return count
+
     def reset_state_flag(self):
         self.state_flag = 0
 
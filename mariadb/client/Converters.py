@@ -0,0 +1,49 @@
+from threading import Lock
+
+# registered converters by data type: list of (charset, flags, converter), last registered first
+_converters = {}
+_converters_lock = Lock()
+
+# incremented on each change, so memoized column parsers are rebuilt
+generation = 0
+
+
+def register_converter(data_type, converter, charset: int = None, flags: int = 0) -> None:
+    """
+    Register a converter for columns of a data type, replacing default decoding.
+    Converter is compiled into column decoder plans. It receives the raw value as bytes, for both protocols,
+    except for numeric fixed length binary protocol values (integers, YEAR, FLOAT and DOUBLE with prepared
+    statements), that are received decoded. Binary protocol DATE, DATETIME, TIMESTAMP and TIME values are
+    formatted as text protocol ones (b'2021-02-03', b'-25:00:00.500'). It is not called for NULL values.
+    Converters apply to all connections. Results having columns with a converter are not decoded by the
+    decode_processes pool.
+
+    :param data_type: column DataType
+    :param converter: function taking the raw value
+    :param charset: only columns with this charset id (63 for binary), None for any charset
+    :param flags: only columns having all these ColumnFlags
+    """
+    global generation
+    with _converters_lock:
+        entries = [entry for entry in _converters.get(data_type, ()) if entry[0] != charset or entry[1] != flags]
+        entries.insert(0, (charset, flags, converter))
+        _converters[data_type] = entries
+        generation += 1
+
+
+def unregister_converter(data_type, charset: int = None, flags: int = 0) -> None:
+    global generation
+    with _converters_lock:
+        entries = [entry for entry in _converters.get(data_type, ()) if entry[0] != charset or entry[1] != flags]
+        if entries:
+            _converters[data_type] = entries
+        else:
+            _converters.pop(data_type, None)
+        generation += 1
+
+
+def find_converter(column):
+    for charset, flags, converter in _converters.get(column.data_type, ()):
+        if (charset is None or charset == column.charset) and (column.flags & flags) == flags:
+            return converter
+    return None
@@ -78,6 +78,46 @@ class PacketReader:
                 return self.readable
 
 
+    def packets(self):
+        """
+        Iterate over packets.
+        Complete packets already in read-ahead buffer are split in one pass without stream calls
+        nor allocation, socket is read only when buffer has no more complete packet.
+        Returned buffer is only valid until next iteration.
+        """
+        if PacketReader.logger.isEnabledFor(logging.DEBUG):
+            while True:
+                yield self.get_packet_from_socket()
+
+        stream = self.stream
+        buf = stream.buf
+        readable = self.readable
+        sequence = self.sequence
+        while True:
+            pos = stream.pos
+            end = stream.end
+            while end - pos >= 4:
+                packet_length = buf[pos] | (buf[pos + 1] << 8) | (buf[pos + 2] << 16)
+                next_pos = pos + 4 + packet_length
+                if next_pos > end or packet_length == MAX_PACKET_SIZE:
+                    break
+                sequence[0] = buf[pos + 3]
+                if next_pos >= end:
+                    stream.pos = 0
+                    stream.end = 0
+                else:
+                    stream.pos = next_pos
+
+                if readable.buf is buf:
+                    readable.pos = pos + 4
+                    readable.limit = next_pos
+                else:
+                    readable.reset(buf, pos + 4, next_pos)
+                yield readable
+                pos = stream.pos
+                end = stream.end
+            yield self.get_packet_from_socket()
+
     def set_server_thread_id(self, server_thread_id, host_address) -> None:
         is_master = host_address.primary if host_address is not None else None
         self.server_thread_log = "conn={} ({})".format(server_thread_id, is_master)
@@ -5,10 +5,10 @@ import struct
 from mariadb.util import ExceptionFactory, LoggerHelper
 
 SMALL_BUFFER_SIZE = 8192
-QUOTE = b'\''
-DBL_QUOTE = b'"'
-ZERO_BYTE = b'\0'
-BACKSLASH = b'\\'
+QUOTE = ord('\'')
+DBL_QUOTE = ord('"')
+ZERO_BYTE = 0
+BACKSLASH = ord('\\')
 SMALL_BUFFER_SIZE = 8192
 MEDIUM_BUFFER_SIZE = 128 * 1024
 LARGE_BUFFER_SIZE = 1024 * 1024
@@ -24,7 +24,7 @@ class PacketWriter:
 
     __slots__ = ('socket', 'initial_buf', 'buf', 'max_query_size_to_log', 'cmd_length',
                  'sequence', 'pos', 'max_packet_length', 'max_allowed_packet', 'permit_trace',
-                 'server_thread_log', 'mark', 'buf_contain_data_after_mark')
+                 'server_thread_log', 'mark', 'buf_contain_data_after_mark', 'deferred', 'pending')
 
     def __init__(self, sock, max_query_size_to_log, sequence):
         self.socket = sock
@@ -40,6 +40,9 @@ class PacketWriter:
         self.server_thread_log = ''
         self.mark = -1
         self.buf_contain_data_after_mark = False
+        # when deferred, packets are queued and sent with next packet
+        self.deferred = False
+        self.pending = bytearray()
 
     def get_cmd_length(self):
         return self.cmd_length
@@ -221,7 +224,7 @@ class PacketWriter:
                     else:
                         for i in range(0, length):
                             if val[i] == QUOTE or val[i] == BACKSLASH or val[i] == DBL_QUOTE or val[i] == ZERO_BYTE:
-                                self.buf[self.pos] = '\\'
+                                self.buf[self.pos] = BACKSLASH
                                 self.pos += 1
                                 if len(self.buf) <= self.pos:
                                     self.write_socket(False)
@@ -247,7 +250,7 @@ class PacketWriter:
                         self.buf[self.pos: self.pos + (i - idx)] = val[idx:i]
                         self.pos += i - idx
                         idx = i
-                    self.buf[self.pos] = '\\'
+                    self.buf[self.pos] = BACKSLASH
                     self.pos += 1
             if idx < length:
                 self.buf[self.pos: self.pos + (length - idx)] = val[idx:length]
@@ -381,7 +384,7 @@ class PacketWriter:
                 else:
                     PacketWriter.logger.debug(
                         "send: content length={} {} com=<hidden>".format(str(length), self.server_thread_log))
-            self.socket.sendall(self.buf[0:self.pos])
+            self.send(self.buf[0:self.pos])
             self.cmd_length += length
 
             # if last com fill the max size, must send an empty com to indicate command end.
@@ -398,8 +401,33 @@ class PacketWriter:
             trace = LoggerHelper.hex(self.buf, 0, 4)
             PacketWriter.logger.debug("send: " + self.server_thread_log + "\n" + trace)
 
-        self.socket.sendall(self.buf[0:4])
+        self.send(self.buf[0:4])
         self.cmd_length = 0
 
+    def cork(self) -> None:
+        # queue packets of following commands, to send them with a single call on uncork
+        self.deferred = True
+
+    def uncork(self) -> None:
+        self.deferred = False
+        if len(self.pending) > 0:
+            self.socket.sendall(self.pending)
+            self.pending = bytearray()
+
+    def send(self, data) -> None:
+        if self.deferred:
+            self.pending += data
+            if len(self.pending) > LARGE_BUFFER_SIZE:
+                # avoid queuing too much data
+                self.socket.sendall(self.pending)
+                self.pending = bytearray()
+        elif len(self.pending) > 0:
+            # send queued packets in the same call
+            self.pending += data
+            self.socket.sendall(self.pending)
+            self.pending = bytearray()
+        else:
+            self.socket.sendall(data)
+
     def close(self):
         self.socket.close()
@@ -2,15 +2,34 @@ from collections import OrderedDict
 
 from mariadb.message.server.CachedPrepareResultPacket import CachedPrepareResultPacket
 
+# approximate memory used by a cache entry, besides sql and column metadata
+ENTRY_OVERHEAD = 512
+
 
 class PrepareLruCache:
 
-    __slots__ = ('cache', 'capacity')
+    __slots__ = ('cache', 'capacity', 'max_bytes', 'bytes', 'entry_bytes', 'entry_hits', 'evicted',
+                 'hits', 'misses', 'evictions', 're_prepares', 'lock')
 
     # initialising capacity
-    def __init__(self, capacity: int):
+    # max_bytes optionally bound estimated memory of cached entries (0: no bound)
+    # lock is the connection lock (NoLock for connections not thread safe)
+    def __init__(self, capacity: int, max_bytes: int, lock):
         self.cache = OrderedDict()
         self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entry_bytes = {}
+        self.entry_hits = {}
+        # recently evicted keys, to detect statements prepared again
+        self.evicted = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.re_prepares = 0
+        # cache is owned by one connection, but may be read (stats) or evicted (garbage collection)
+        # from other threads: mutations must not interleave without GIL
+        self.lock = lock
 
     # we return the value of the key
     # that is queried in O(1) and return -1 if we
@@ -18,28 +37,108 @@ class PrepareLruCache:
     # And also move the key to the end
     # to show that it was recently used.
     def get(self, key: str) -> CachedPrepareResultPacket:
-        if key not in self.cache:
-            return None
-        else:
-            self.cache.move_to_end(key)
-            return self.cache[key]
+        with self.lock:
+            if key not in self.cache:
+                self.misses += 1
+                return None
+            else:
+                self.hits += 1
+                self.entry_hits[key] += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+    # lookup without statistics nor recency update
+    def peek(self, key: str) -> CachedPrepareResultPacket:
+        return self.cache.get(key)
+
+    # entry metadata changed: update its estimated size
+    def resize(self, key: str, value: CachedPrepareResultPacket) -> None:
+        removed = []
+        with self.lock:
+            if self.cache.get(key) is not value:
+                return
+            size = entry_size(key, value)
+            self.bytes += size - self.entry_bytes[key]
+            self.entry_bytes[key] = size
+            while 0 < self.max_bytes < self.bytes and len(self.cache) > 1:
+                removed.append(self.evict())
+        for removed_value in removed:
+            removed_value.un_cache()
 
     # first, we add / update the key by conventional methods.
     # And also move the key to the end to show that it was recently used.
     # But here we will also check whether the length of our
     # ordered dictionary has exceeded our capacity,
     # If so we remove the first key (least recently used)
+    # Evicted statements are closed after leaving the lock.
     def put(self, key: str, value: CachedPrepareResultPacket) -> str:
-        if key not in self.cache:
-            self.cache[key] = value
-            self.cache.move_to_end(key)
-        else:
+        removed = []
+        with self.lock:
+            cached = key in self.cache
+            if not cached:
+                self.cache[key] = value
+                self.cache.move_to_end(key)
+                size = entry_size(key, value)
+                self.entry_bytes[key] = size
+                self.entry_hits[key] = 0
+                self.bytes += size
+                if self.evicted.pop(key, None) is not None:
+                    self.re_prepares += 1
+                while len(self.cache) > self.capacity or (0 < self.max_bytes < self.bytes and len(self.cache) > 1):
+                    removed.append(self.evict())
+
+        if cached:
             #self.cache[key].incrementUse(prepared_statement)
             value.un_cache()
             return key
-
-        if len(self.cache) > self.capacity:
-            (removed_key, removed_value) = self.cache.popitem(last=False)
+        for removed_value in removed:
             removed_value.un_cache()
-
         return None
+
+    # remove least recently used entry, returned to be closed by caller once lock is released
+    def evict(self) -> CachedPrepareResultPacket:
+        (removed_key, removed_value) = self.cache.popitem(last=False)
+        self.bytes -= self.entry_bytes.pop(removed_key)
+        del self.entry_hits[removed_key]
+        self.evictions += 1
+        self.evicted[removed_key] = True
+        if len(self.evicted) > self.capacity:
+            self.evicted.popitem(last=False)
+        return removed_value
+
+    def reset(self) -> None:
+        with self.lock:
+            values = list(self.cache.values())
+            self.cache.clear()
+            self.entry_bytes.clear()
+            self.entry_hits.clear()
+            self.evicted.clear()
+            self.bytes = 0
+        for value in values:
+            value.un_cache()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "size": len(self.cache),
+                "capacity": self.capacity,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "re_prepares": self.re_prepares
+            }
+
+    # return the most used entries, as (sql, hits) tuples
+    def hottest(self, limit: int = 10) -> list:
+        with self.lock:
+            entries = list(self.entry_hits.items())
+        return sorted(entries, key=lambda entry: entry[1], reverse=True)[0:limit]
+
+
+def entry_size(key: str, value: CachedPrepareResultPacket) -> int:
+    size = ENTRY_OVERHEAD + len(key)
+    for col in value.columns:
+        size += len(col.saved)
+    return size
@@ -1,7 +1,6 @@
 import json
 import struct
-from datetime import date, datetime, time
-from struct import unpack
+from datetime import date, datetime, time, timedelta
 
 BYTE_PARSER = struct.Struct('<b')
 SHORT_PARSER = struct.Struct('<h')
@@ -10,6 +9,9 @@ INT_PARSER = struct.Struct('<i')
 INT_UNSIGNED_PARSER = struct.Struct('<I')
 LONG_PARSER = struct.Struct('<q')
 LONG_UNSIGNED_PARSER = struct.Struct('<Q')
+FLOAT_PARSER = struct.Struct('<f')
+DOUBLE_PARSER = struct.Struct('<d')
+DOUBLE_BE_PARSER = struct.Struct('>d')
 
 
 class ReadableByteBuf:
@@ -26,9 +28,11 @@ class ReadableByteBuf:
 
     def reset(self, buf, pos, limit):
         self.pos = pos
-        self.buf = buf
-        self.view = memoryview(buf)
         self.limit = limit
+        # keep current view when reading again from the same buffer (usual read-ahead buffer case)
+        if buf is not self.buf:
+            self.buf = buf
+            self.view = memoryview(buf)
 
     def skip_one(self):
         self.pos += 1
@@ -38,7 +42,7 @@ class ReadableByteBuf:
 
     def read_blob(self, length):
         self.pos += length
-        return self.buf[self.pos - length:length]
+        return bytes(self.view[self.pos - length:self.pos])
 
     def get_byte(self, index=None):
         return self.buf[self.pos] if index is None else self.buf[index]
@@ -109,44 +113,33 @@ class ReadableByteBuf:
         length = self.read_length()
         if length is None:
             return None
-
-        res = []
-        value = 0
-        init_pos = self.pos
         self.pos += length
-        while init_pos < self.pos:
-            char = self.buf[init_pos]
-            init_pos += 1
-            if char == 45:
-                # minus separator
-                res.append(value)
-                value = 0
-            else:
-                value = value * 10 + char - 48
-        res.append(value)
-
-        # handle zero-date as null
-        if res[0] == 0 and res[1] == 0 and res[2] == 0:
-            return None
-        return date(res[0], res[1], res[2])
+        return parse_date(str(self.view[self.pos - length: self.pos], 'ascii'))
 
     def read_datetime_length_encoded(self) -> datetime:
         length = self.read_length()
         if length is None:
             return None
-        val = self.read_ascii(length)
-        if val.startswith('0000-00-00 00:00:00'):
-            return None
-        return datetime.fromisoformat(val)
+        self.pos += length
+        return parse_datetime(str(self.view[self.pos - length: self.pos], 'ascii'))
 
-    def read_time_length_encoded(self) -> time:
+    def read_time_length_encoded(self):
         length = self.read_length()
         if length is None:
             return None
-        val = self.read_ascii(length)
-        if val.startswith('0000-00-00 00:00:00'):
+        self.pos += length
+        return parse_time(str(self.view[self.pos - length: self.pos], 'ascii'))
+
+    def read_view(self, length):
+        self.pos += length
+        return self.view[self.pos - length:self.pos]
+
+    def read_view_length_encoded(self):
+        length = self.read_length()
+        if length is None:
             return None
-        return time.fromisoformat(val)
+        self.pos += length
+        return self.view[self.pos - length:self.pos]
 
     def read_string_length_encoded(self):
         length = self.buf[self.pos]
@@ -165,6 +158,23 @@ class ReadableByteBuf:
             self.pos += length
         return str(self.view[self.pos - length: self.pos], 'utf-8')
 
+    def read_bytes_length_encoded(self):
+        length = self.buf[self.pos]
+        if length < 0xfb:
+            self.pos += length + 1
+        else:
+            self.pos += 1
+            if length == 0xfb:
+                return None
+            if length == 0xfc:
+                length = self.read_unsigned_short()
+            elif length == 0xfd:
+                length = self.read_unsigned_medium()
+            else:
+                length = self.read_long()
+            self.pos += length
+        return bytes(self.view[self.pos - length: self.pos])
+
     def read_json_length_encoded(self):
         return json.loads(self.read_string_length_encoded())
 
@@ -191,6 +201,10 @@ class ReadableByteBuf:
         self.pos += 2
         return SHORT_UNSIGNED_PARSER.unpack_from(self.buf, self.pos - 2)[0]
 
+    def read_unsigned_medium(self) -> int:
+        self.pos += 3
+        return self.buf[self.pos - 3] | (self.buf[self.pos - 2] << 8) | (self.buf[self.pos - 1] << 16)
+
     def read_int(self) -> int:
         self.pos += 4
         return INT_PARSER.unpack_from(self.buf, self.pos - 4)[0]
@@ -210,14 +224,14 @@ class ReadableByteBuf:
     def read_bytes(self, dest):
         length = len(dest)
         self.pos += length
-        dest[0:length] = self.buf[self.pos - length: self.pos]
+        dest[0:length] = self.view[self.pos - length: self.pos]
 
     def read_bytes_null_end(self):
         cnt = 0
         while self.readable_bytes() > 0 and self.buf[self.pos] != 0:
             cnt += 1
         dst = bytearray(cnt)
-        dst[0:cnt] = self.buf[self.pos: self.pos + cnt]
+        dst[0:cnt] = self.view[self.pos: self.pos + cnt]
         self.pos += cnt
         return dst
 
@@ -225,8 +239,8 @@ class ReadableByteBuf:
         self.pos += length
         return self.view[self.pos - length: self.pos]
 
-    def save_buf(self):
-        return self.buf[self.pos: self.limit]
+    def save_buf(self) -> bytes:
+        return bytes(self.view[self.pos: self.limit])
 
     def read_length_buffer(self):
         length = self.read_length_not_null()
@@ -257,15 +271,15 @@ class ReadableByteBuf:
 
     def read_float(self):
         self.pos += 4
-        return unpack("<f", self.buf[self.pos - 4: self.pos])[0]
+        return FLOAT_PARSER.unpack_from(self.buf, self.pos - 4)[0]
 
     def read_double(self):
         self.pos += 8
-        return unpack("<d", self.buf[self.pos - 8: self.pos])[0]
+        return DOUBLE_PARSER.unpack_from(self.buf, self.pos - 8)[0]
 
     def read_double_be(self):
         self.pos += 8
-        return unpack(">d", self.buf[self.pos - 8: self.pos])[0]
+        return DOUBLE_BE_PARSER.unpack_from(self.buf, self.pos - 8)[0]
 
     def read_datetime(self):
         length = self.read_length()
@@ -295,12 +309,127 @@ class ReadableByteBuf:
     def read_time(self):
         length = self.read_length()
         if length == 0:
-            return None
-        self.pos += 3  # negate + days
+            return time(0)
+        negative = self.read_unsigned_byte() == 1
+        days = self.read_unsigned_int()
+        hour = self.read_unsigned_byte()
+        minutes = self.read_unsigned_byte()
+        seconds = self.read_unsigned_byte()
+        microseconds = 0
+        if length > 8:
+            microseconds = self.read_unsigned_int()
+        return time_value(negative, days * 24 + hour, minutes, seconds, microseconds)
+
+
+    # binary protocol temporal values, formatted as text protocol ones (for converters)
+
+    def read_date_text(self) -> bytes:
+        length = self.read_length()
+        if length == 0:
+            return b'0000-00-00'
+        value = b'%04d-%02d-%02d' % (self.read_unsigned_short(), self.read_unsigned_byte(), self.read_unsigned_byte())
+        self.pos += length - 4
+        return value
+
+    def read_datetime_text(self, decimals: int) -> bytes:
+        length = self.read_length()
+        if length == 0:
+            return b'0000-00-00 00:00:00' + fraction_text(0, decimals)
+        year = self.read_unsigned_short()
+        month = self.read_unsigned_byte()
+        day_of_month = self.read_unsigned_byte()
+        hour, minutes, seconds, microseconds = 0, 0, 0, 0
+        if length > 4:
+            hour = self.read_unsigned_byte()
+            minutes = self.read_unsigned_byte()
+            seconds = self.read_unsigned_byte()
+            if length > 7:
+                microseconds = self.read_unsigned_int()
+        return b'%04d-%02d-%02d %02d:%02d:%02d' % (year, month, day_of_month, hour, minutes, seconds) \
+            + fraction_text(microseconds, decimals)
+
+    def read_time_text(self, decimals: int) -> bytes:
+        length = self.read_length()
+        if length == 0:
+            return b'00:00:00' + fraction_text(0, decimals)
+        negative = self.read_unsigned_byte() == 1
+        days = self.read_unsigned_int()
         hour = self.read_unsigned_byte()
         minutes = self.read_unsigned_byte()
         seconds = self.read_unsigned_byte()
         microseconds = 0
         if length > 8:
             microseconds = self.read_unsigned_int()
-        return time(hour, minutes, seconds, microseconds)
+        return (b'-' if negative else b'') + b'%02d:%02d:%02d' % (days * 24 + hour, minutes, seconds) \
+            + fraction_text(microseconds, decimals)
+
+
+# ***************************************************
+# text protocol temporal values
+# ***************************************************
+
+# fromisoformat fast path (python 3.7+)
+ISO_FORMAT = hasattr(date, 'fromisoformat')
+
+def parse_date(val: str) -> date:
+    if len(val) == 10 and ISO_FORMAT:
+        if val == '0000-00-00':
+            # handle zero-date as null
+            return None
+        return date.fromisoformat(val)
+    parts = val.split('-')
+    year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
+    if year == 0 and month == 0 and day == 0:
+        return None
+    return date(year, month, day)
+
+
+def parse_datetime(val: str) -> datetime:
+    if val.startswith('0000-00-00'):
+        return None
+    length = len(val)
+    if (length == 19 or length == 26) and ISO_FORMAT:
+        # no or 6 fractional digits
+        return datetime.fromisoformat(val)
+    # fixed offsets, any fractional precision
+    microseconds = int(val[20:26].ljust(6, '0')) if length > 20 else 0
+    return datetime(int(val[0:4]), int(val[5:7]), int(val[8:10]), int(val[11:13]), int(val[14:16]),
+                    int(val[17:19]), microseconds)
+
+
+def parse_time(val: str):
+    length = len(val)
+    if (length == 8 or length == 15) and val[2] == ':' and val[0:2] < '24' and ISO_FORMAT:
+        return time.fromisoformat(val)
+    # negative, 24 hours and more or other fractional precision
+    negative = val[0] == '-'
+    if negative:
+        val = val[1:]
+    hour_end = val.index(':')
+    hours = int(val[0:hour_end])
+    minutes = int(val[hour_end + 1:hour_end + 3])
+    seconds = int(val[hour_end + 4:hour_end + 6])
+    microseconds = int(val[hour_end + 7:hour_end + 13].ljust(6, '0')) if len(val) > hour_end + 7 else 0
+    return time_value(negative, hours, minutes, seconds, microseconds)
+
+
+def time_value(negative: bool, hours: int, minutes: int, seconds: int, microseconds: int):
+    """
+    TIME value, for both protocols: time of day, or timedelta when negative or 24 hours and more
+    """
+    if not negative and hours < 24:
+        return time(hours, minutes, seconds, microseconds)
+    delta = timedelta(hours=hours, minutes=minutes, seconds=seconds, microseconds=microseconds)
+    return -delta if negative else delta
+
+
+def fraction_text(microseconds: int, decimals: int) -> bytes:
+    """
+    Fractional seconds as sent by text protocol: column decimals digits, or 6 digits when set for
+    columns without fixed decimals
+    """
+    if 0 < decimals <= 6:
+        return b'.' + (b'%06d' % microseconds)[:decimals]
+    if decimals > 6 and microseconds:
+        return b'.%06d' % microseconds
+    return b''
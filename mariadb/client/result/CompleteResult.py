@@ -1,5 +1,7 @@
+from mariadb.client import Converters
 from mariadb.client.Context import Context
 from mariadb.client.PacketReader import PacketReader
+from mariadb.client.result.DecodePool import POOL_AVAILABLE, decoder_pool, decode_plan, decode_rows
 from mariadb.client.result.Result import Result
 
 
@@ -7,22 +9,77 @@ class CompleteResult(Result):
 
     __slots__ = ('data', 'data_len', 'pos')
 
-    def __init__(self, binary_protocol: bool, metadata_list: list, reader: PacketReader, context: Context):
-        super(CompleteResult, self).__init__(binary_protocol, metadata_list, reader, context)
+    def __init__(self, binary_protocol: bool, metadata_list: list, reader: PacketReader, context: Context,
+                 parse_fcts: list = None, builder=tuple, raw: bool = False):
+        super(CompleteResult, self).__init__(binary_protocol, metadata_list, reader, context, parse_fcts, builder,
+                                             raw)
 
         res = []
-        next = super().read_next
+        read_row = self.read_row
         append = res.append
 
-        tup = next()
-        while tup is not None:
+        # large result-sets may be decoded by a process pool, after a first chunk decoded locally
+        processes = context.conf.get('decode_processes')
+        chunk_rows = context.conf.get('decode_chunk_rows') if processes and self.process_decodable(raw) else -1
+
+        packets = reader.packets()
+        for buf in packets:
+            tup = read_row(buf)
+            if tup is None:
+                break
             append(tup)
-            tup = next()
+            if len(res) == chunk_rows:
+                res.extend(self.decode_in_processes(packets, processes, chunk_rows))
+                break
 
         self.data = tuple(res)
         self.data_len = len(self.data)
         self.pos = 0
 
+    def process_decodable(self, raw: bool) -> bool:
+        # workers only build default parsers: results decoded differently are decoded locally
+        conf = self.context.conf
+        if not POOL_AVAILABLE or raw or conf.get('intern_values') or conf.get('temporal_cache_size') > 0 or conf.get('result_arena'):
+            return False
+        for col in self.cols:
+            if Converters.find_converter(col) is not None:
+                return False
+        return True
+
+    def decode_in_processes(self, packets, processes: int, chunk_rows: int) -> list:
+        """
+        Read remaining row packets, decoded by chunks in a process pool
+        :param packets: packet iterator
+        :param processes: pool size
+        :param chunk_rows: number of rows by chunk
+        :return: decoded rows, in order
+        """
+        pool = decoder_pool(processes)
+        plan = decode_plan(self.binary, self.cols)
+        end_max_length = 16777215 if self.context.eof_deprecated else 8
+        futures = []
+        chunk = []
+        for buf in packets:
+            header = buf.buf[buf.pos]
+            if header == 0xFF or (header == 0xFE and buf.readable_bytes() < end_max_length):
+                # error or end of result-set
+                self.read_row(buf)
+                break
+            chunk.append(bytes(buf.view[buf.pos:buf.limit]))
+            if len(chunk) == chunk_rows:
+                futures.append(pool.submit(decode_rows, plan, chunk))
+                chunk = []
+        if chunk:
+            futures.append(pool.submit(decode_rows, plan, chunk))
+
+        res = []
+        for future in futures:
+            if self.builder is tuple:
+                res.extend(future.result())
+            else:
+                res.extend(map(self.builder, future.result()))
+        return res
+
     def fetchone(self) -> tuple:
         if self.pos >= self.data_len:
             return None
@@ -40,5 +97,11 @@ class CompleteResult(Result):
     def fetchall(self) -> tuple:
         return self.data
 
+    def __iter__(self):
+        data = self.data
+        while self.pos < self.data_len:
+            self.pos += 1
+            yield data[self.pos - 1]
+
     def streaming(self) -> bool:
         return False
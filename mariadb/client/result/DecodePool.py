@@ -0,0 +1,84 @@
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from mariadb.client.ReadableByteBuf import ReadableByteBuf
+from mariadb.message.server.Column import Column
+
+# pool start method can only be chosen since python 3.7: results are decoded locally before
+POOL_AVAILABLE = sys.version_info >= (3, 7)
+
+# process pools, by number of processes, shared by all connections
+_pools = {}
+_pools_lock = threading.Lock()
+
+# worker side: decoder plans already built, by plan
+_parsers = {}
+_PARSERS_MAX_SIZE = 64
+
+
+def decoder_pool(processes: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(processes)
+        if pool is None:
+            # not forking a process that may run other threads (prefetch, application)
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method))
+            _pools[processes] = pool
+        return pool
+
+
+def decode_plan(binary: bool, columns: list) -> tuple:
+    """
+    Picklable decoder plan: protocol and raw column definitions, from which workers build default parsers
+    (see CompleteResult.process_decodable)
+    """
+    return binary, tuple(bytes(col.saved) for col in columns)
+
+
+def plan_parsers(plan: tuple) -> list:
+    parsers = _parsers.get(plan)
+    if parsers is None:
+        binary, saved_columns = plan
+        parsers = [Column.decode(ReadableByteBuf(saved, 0, len(saved)), False).parser(binary)
+                   for saved in saved_columns]
+        if len(_parsers) >= _PARSERS_MAX_SIZE:
+            _parsers.clear()
+        _parsers[plan] = parsers
+    return parsers
+
+
+def decode_rows(plan: tuple, packets: list) -> list:
+    """
+    Decode row packets (without packet header) in a worker process
+    :param plan: decoder plan, see decode_plan
+    :param packets: row packets content
+    :return: decoded rows, in packet order
+    """
+    binary = plan[0]
+    parse_fcts = plan_parsers(plan)
+    meta_len = len(parse_fcts)
+    bitmap_len = (meta_len + 9) >> 3
+    res = [None] * meta_len
+    rows = []
+    append = rows.append
+    buf = ReadableByteBuf(b'', 0, 0)
+    for packet in packets:
+        buf.reset(packet, 0, len(packet))
+        if binary:
+            buf.pos = 1 + bitmap_len
+            i = 0
+            for parse_fct in parse_fcts:
+                if packet[1 + ((i + 2) >> 3)] & (1 << ((i + 2) & 7)):
+                    res[i] = None
+                else:
+                    res[i] = parse_fct(buf)
+                i += 1
+        else:
+            i = 0
+            for parse_fct in parse_fcts:
+                res[i] = parse_fct(buf)
+                i += 1
+        append(tuple(res))
+    return rows
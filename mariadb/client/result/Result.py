@@ -1,14 +1,20 @@
+from collections import namedtuple
+from functools import lru_cache
 from threading import RLock
+from mariadb.client import Converters
 from mariadb.client.Context import Context
 from mariadb.client.PacketReader import PacketReader
-from mariadb.client.ReadableByteBuf import ReadableByteBuf
+from mariadb.client.ReadableByteBuf import ReadableByteBuf, parse_date, parse_datetime, parse_time
+from mariadb.client.result.ResultArena import ResultArena, arena_parsers
 from mariadb.message.server.ErrorPacket import ErrorPacket
-from mariadb.util.constant import ServerStatus
+from mariadb.client.DataType import DataType
+from mariadb.util.constant import ColumnFlags, ServerStatus
 
 
 class Result:
-    __slots__ = ('closed', 'loaded', 'output_parameter', 'reader', 'exception_factory', 'context', 'cols', 'binary', 'meta_len', 'parser', 'res', 'parse_fcts')
-    def __init__(self, binary_protocol: bool, metadata_list, reader: PacketReader, context: Context):
+    __slots__ = ('closed', 'loaded', 'output_parameter', 'reader', 'exception_factory', 'context', 'cols', 'binary', 'meta_len', 'parser', 'res', 'parse_fcts', 'builder', 'name_index', 'shared_buf')
+    def __init__(self, binary_protocol: bool, metadata_list, reader: PacketReader, context: Context,
+                 parse_fcts: list = None, builder=tuple, raw: bool = False):
         self.reader = reader
         self.exception_factory = context.exception_factory
         self.context = context
@@ -21,15 +27,54 @@ class Result:
         self.meta_len = len(metadata_list)
         self.parser = self.decode_binary if binary_protocol else self.decode_text
         self.res = [None] * self.meta_len
-        self.parse_fcts = [None] * self.meta_len
-        for i, col in enumerate(self.cols):
-            self.parse_fcts[i] = col.parser(binary_protocol)
+        # build a row from decoded values
+        self.builder = builder
+        # column index by name, built on first lookup
+        self.name_index = None
+        self.shared_buf = None
+        if raw:
+            # read-ahead buffer, reused for next packets
+            self.shared_buf = reader.stream.buf
+            self.parser = self.decode_raw
+            self.parse_fcts = raw_parsers(binary_protocol, self.cols)
+            return
+        if parse_fcts is not None:
+            # decoder plan already built for these columns
+            self.parse_fcts = parse_fcts
+        else:
+            self.parse_fcts = [None] * self.meta_len
+            for i, col in enumerate(self.cols):
+                self.parse_fcts[i] = col.parser(binary_protocol)
 
+        if context.conf.get('intern_values'):
+            self.parse_fcts = interning_parsers(self.parse_fcts, self.cols, context.conf.get('intern_max_values'))
+        if not binary_protocol and context.conf.get('temporal_cache_size') > 0:
+            self.parse_fcts = memo_temporal_parsers(self.parse_fcts, self.cols, context.conf.get('temporal_cache_size'))
+        if context.conf.get('result_arena'):
+            self.parse_fcts = arena_parsers(self.parse_fcts, self.cols, ResultArena(reader.stream.buf))
 
+    def description(self) -> tuple:
+        return tuple([col.description() for col in self.cols])
 
+    def column_index(self, name: str) -> int:
+        if self.name_index is None:
+            name_index = {}
+            for i, col in enumerate(self.cols):
+                # first column wins for duplicate names, case insensitive as the server
+                name_index.setdefault(col.get_name(), i)
+                name_index.setdefault(col.get_name().lower(), i)
+            self.name_index = name_index
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index.get(name.lower())
+            if index is None:
+                raise self.exception_factory.create("No such column: {}".format(name), "42S22")
+        return index
 
     def read_next(self) -> tuple:
-        buf = self.reader.get_packet_from_socket()
+        return self.read_row(self.reader.get_packet_from_socket())
+
+    def read_row(self, buf: ReadableByteBuf) -> tuple:
         header = buf.get_unsigned_byte()
         if header == 0xFF:
             self.loaded = True
@@ -60,19 +105,39 @@ class Result:
             return self.parser(buf)
 
     def decode_binary(self, buf: ReadableByteBuf) -> tuple:
-        buf.skip_one()
-        null_bitmap = buf.read_buffer(int((self.meta_len + 9) / 8))
-        for i, parse_fct in enumerate(self.parse_fcts):
-            if (null_bitmap[int((i + 2) / 8)] & (1 << ((i + 2) % 8))) > 0:
-                self.res[i] = None
+        # null bitmap is read in place, with a 2 bits offset
+        null_pos = buf.pos + 1
+        buf.pos = null_pos + ((self.meta_len + 9) >> 3)
+        raw = buf.buf
+        res = self.res
+        i = 0
+        for parse_fct in self.parse_fcts:
+            if raw[null_pos + ((i + 2) >> 3)] & (1 << ((i + 2) & 7)):
+                res[i] = None
             else:
-                self.res[i] = parse_fct(buf)
-        return tuple(self.res)
+                res[i] = parse_fct(buf)
+            i += 1
+        return self.builder(res)
 
     def decode_text(self, buf: ReadableByteBuf) -> tuple:
-        for i, parse_fct in enumerate(self.parse_fcts):
-            self.res[i] = parse_fct(buf)
-        return tuple(self.res)
+        res = self.res
+        i = 0
+        for parse_fct in self.parse_fcts:
+            res[i] = parse_fct(buf)
+            i += 1
+        return self.builder(res)
+
+    def decode_raw(self, buf: ReadableByteBuf) -> tuple:
+        """
+        Row of undecoded values, as memoryview delimited by length encoded / fixed length boundaries.
+        Values of a row share one buffer, kept as long as one of the values is referenced:
+        packet own buffer for big packets (without copy), or one copy of the row packet when
+        read in the reused read-ahead buffer.
+        """
+        if buf.buf is self.shared_buf:
+            row = buf.view[buf.pos:buf.limit].tobytes()
+            buf = ReadableByteBuf(row, 0, len(row))
+        return self.decode_binary(buf) if self.binary else self.decode_text(buf)
 
     def skip_remaining(self):
         while True:
@@ -130,9 +195,6 @@ class Result:
     def abort(self) -> None:
         self.closed = True
 
-    def close_from_stmt_close(self, lock: RLock):
-        self.closed = True
-
     def fetchone(self) -> tuple:
         pass
 
@@ -144,3 +206,156 @@ class Result:
 
     def streaming(self) -> bool:
         pass
+
+
+def row_builder(row_factory, columns: list):
+    """
+    Row builder for a row factory, built once per result metadata
+    :param row_factory: None or tuple (default), dict, collections.namedtuple,
+                        or a class / callable taking column values as positional arguments
+    :param columns: result-set columns
+    :return: function creating a row from decoded values list
+    """
+    if row_factory is None or row_factory is tuple:
+        return tuple
+    if row_factory is dict:
+        keys = tuple([col.get_name() for col in columns])
+        return lambda values: dict(zip(keys, values))
+    if row_factory is namedtuple:
+        return namedtuple_class(tuple([col.get_name() for col in columns]))._make
+    return lambda values: row_factory(*values)
+
+
+@lru_cache(maxsize=128)
+def namedtuple_class(names: tuple):
+    return namedtuple('Row', names, rename=True)
+
+
+# string columns up to this length (in bytes) are considered low-cardinality candidates
+INTERN_MAX_LENGTH = 128
+STRING_TYPES = (DataType.VARCHAR, DataType.VARSTRING, DataType.STRING)
+
+
+def interning_parsers(parse_fcts: list, columns: list, max_values: int) -> list:
+    """
+    Wrap parsers of ENUM, SET and short string columns, so equal values of a result share one object.
+    Columns with a registered converter are left unchanged.
+    SET values are returned as frozensets.
+    Each column cache is bounded to max_values distinct values, later new values are not interned.
+    """
+    res = list(parse_fcts)
+    for i, col in enumerate(columns):
+        if Converters.find_converter(col) is not None:
+            # registered converter has precedence
+            continue
+        if (col.flags & ColumnFlags.SET) > 0:
+            res[i] = interning_set_parser(max_values)
+        elif (col.flags & ColumnFlags.ENUM) > 0 or (
+                col.data_type in STRING_TYPES and col.charset != 63 and col.length <= INTERN_MAX_LENGTH):
+            res[i] = interning_parser(parse_fcts[i], max_values)
+    return res
+
+
+def interning_parser(parse_fct, max_values: int):
+    cache = {}
+
+    def parse(buf):
+        value = parse_fct(buf)
+        interned = cache.get(value)
+        if interned is None:
+            if value is None or len(cache) >= max_values:
+                return value
+            cache[value] = value
+            return value
+        return interned
+    return parse
+
+
+def interning_set_parser(max_values: int):
+    cache = {}
+
+    def parse(buf):
+        value = buf.read_string_length_encoded()
+        if value is None:
+            return None
+        interned = cache.get(value)
+        if interned is None:
+            interned = frozenset(value.split(',')) if value else frozenset()
+            if len(cache) < max_values:
+                cache[value] = interned
+        return interned
+    return parse
+
+
+TEMPORAL_PARSERS = {
+    DataType.DATE: parse_date,
+    DataType.NEWDATE: parse_date,
+    DataType.TIMESTAMP: parse_datetime,
+    DataType.DATETIME: parse_datetime,
+    DataType.TIME: parse_time
+}
+MISSING = object()
+
+
+def memo_temporal_parsers(parse_fcts: list, columns: list, size: int) -> list:
+    """
+    Wrap text protocol parsers of temporal columns with a cache by raw value, for repeated values.
+    Columns with a registered converter are left unchanged.
+    Each column cache is bounded to size values, later new values are parsed each time.
+    """
+    res = list(parse_fcts)
+    for i, col in enumerate(columns):
+        parse_value = TEMPORAL_PARSERS.get(col.data_type)
+        if parse_value is not None and Converters.find_converter(col) is None:
+            res[i] = memo_temporal_parser(parse_value, size)
+    return res
+
+
+def memo_temporal_parser(parse_value, size: int):
+    cache = {}
+
+    def parse(buf):
+        length = buf.read_length()
+        if length is None:
+            return None
+        buf.pos += length
+        raw = str(buf.view[buf.pos - length: buf.pos], 'ascii')
+        value = cache.get(raw, MISSING)
+        if value is MISSING:
+            value = parse_value(raw)
+            if len(cache) < size:
+                cache[raw] = value
+        return value
+    return parse
+
+
+# binary protocol fixed length values size, other values being length encoded
+RAW_FIXED_LENGTHS = {
+    DataType.TINYINT: 1,
+    DataType.SMALLINT: 2,
+    DataType.YEAR: 2,
+    DataType.INTEGER: 4,
+    DataType.MEDIUMINT: 4,
+    DataType.BIGINT: 8,
+    DataType.FLOAT: 4,
+    DataType.DOUBLE: 8
+}
+
+
+def raw_parsers(binary: bool, columns: list) -> list:
+    """
+    Parsers returning undecoded values, as memoryview of the value bytes (without length prefix).
+    Binary protocol temporal values keep their binary encoding, other values are server text representation.
+    """
+    res = [None] * len(columns)
+    for i, col in enumerate(columns):
+        length = RAW_FIXED_LENGTHS.get(col.data_type) if binary else None
+        if length is None:
+            res[i] = lambda buf: buf.read_view_length_encoded()
+        else:
+            res[i] = raw_fixed_parser(length)
+    return res
+
+
+def raw_fixed_parser(length: int):
+    return lambda buf: buf.read_view(length)
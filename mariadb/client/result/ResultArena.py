@@ -0,0 +1,53 @@
+from mariadb.client import DataTypeMap  # noqa: F401 (loaded before DataType, that depends on it)
+from mariadb.client import Converters
+from mariadb.client.DataType import DataType
+
+ARENA_CHUNK_SIZE = 64 * 1024
+ARENA_TYPES = (DataType.TINYBLOB, DataType.MEDIUMBLOB, DataType.LONGBLOB, DataType.BLOB, DataType.VARSTRING,
+               DataType.STRING, DataType.VARCHAR, DataType.GEOMETRY, DataType.BIT)
+
+
+class ResultArena:
+    """
+    Stable storage of binary column values of a result, returned as memoryview.
+    Values received in the shared read-ahead buffer are copied once in fixed size chunks.
+    Packets read in their own buffer (packets bigger than read-ahead buffer) are adopted, values being views
+    of the packet without copy.
+    Chunks and adopted packets are released when no more value references them.
+    """
+
+    __slots__ = ('shared_buf', 'chunk', 'chunk_pos')
+
+    def __init__(self, shared_buf):
+        # read-ahead buffer, reused for next packets
+        self.shared_buf = shared_buf
+        self.chunk = None
+        self.chunk_pos = ARENA_CHUNK_SIZE
+
+    def read_view_length_encoded(self, buf) -> memoryview:
+        length = buf.read_length()
+        if length is None:
+            return None
+        buf.pos += length
+        if buf.buf is not self.shared_buf:
+            # packet buffer is not reused: adopted
+            return buf.view[buf.pos - length:buf.pos]
+        if self.chunk_pos + length > ARENA_CHUNK_SIZE:
+            self.chunk = memoryview(bytearray(max(ARENA_CHUNK_SIZE, length)))
+            self.chunk_pos = 0
+        start = self.chunk_pos
+        self.chunk_pos += length
+        view = self.chunk[start:self.chunk_pos]
+        view[:] = buf.view[buf.pos - length:buf.pos]
+        return view
+
+
+def arena_parsers(parse_fcts: list, columns: list, arena: ResultArena) -> list:
+    """
+    Replace parsers of binary columns (without registered converter) by arena parsers
+    """
+    res = list(parse_fcts)
+    for i, col in enumerate(columns):
+        if col.charset == 63 and col.data_type in ARENA_TYPES and Converters.find_converter(col) is None:
+            res[i] = arena.read_view_length_encoded
+    return res
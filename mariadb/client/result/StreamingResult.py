@@ -1,36 +1,176 @@
+import threading
+from queue import Full, Queue
+
 from mariadb.client.Context import Context
 from mariadb.client.PacketReader import PacketReader
 from mariadb.client.result.Result import Result
 
+# seconds between checks of stop flag while waiting for consumer
+OFFER_TIMEOUT = 0.1
+
 
 class StreamingResult(Result):
+    """
+    Result-set read by batches of fetch_size rows.
+    Next batch is received and decoded by a background thread while the current one is consumed,
+    so network wait overlaps with application processing.
+    Connection must not read other responses before result is completely read (see Client.fetch_streaming).
+    Background thread ends when result is read, closed or aborted (connection closed).
+    """
+
+    __slots__ = ('data', 'data_len', 'pos', 'fetch_size', 'batches', 'worker', 'eof', 'stopped', 'failed')
 
-    def __init__(self, binary_protocol: bool, metadata_list: list, reader: PacketReader, context: Context):
-        super(StreamingResult, self).__init__(binary_protocol, metadata_list, reader, context)
+    def __init__(self, binary_protocol: bool, metadata_list: list, reader: PacketReader, context: Context,
+                 parse_fcts: list = None, builder=tuple, fetch_size: int = 1, raw: bool = False):
+        super(StreamingResult, self).__init__(binary_protocol, metadata_list, reader, context, parse_fcts, builder,
+                                              raw)
+        self.fetch_size = fetch_size if fetch_size > 0 else 1
+        self.data = ()
+        self.data_len = 0
+        self.pos = 0
+        # set when all batches have been handed to consumer
+        self.eof = False
+        # set to stop background thread
+        self.stopped = False
+        # set when background thread ended on error
+        self.failed = False
+        # one batch ready in advance, besides the one being read
+        self.batches = Queue(1)
+        self.worker = threading.Thread(target=self.prefetch, name="mariadb-prefetch", daemon=True)
+        self.worker.start()
+
+    def read_batch(self) -> tuple:
         res = []
-        tup = super.read_next()
-        while tup is not None:
-            res.append(tup)
-            tup = super.read_next()
-        self.data = tuple(res)
+        read_row = self.read_row
+        append = res.append
+        remaining = self.fetch_size
+
+        for buf in self.reader.packets():
+            tup = read_row(buf)
+            if tup is None:
+                break
+            append(tup)
+            remaining -= 1
+            if remaining == 0:
+                break
+        return tuple(res)
+
+    def prefetch(self) -> None:
+        # background thread: only one reading socket until end of result-set
+        try:
+            while not self.loaded and not self.stopped:
+                if not self.offer(self.read_batch()):
+                    return
+        except Exception as e:
+            self.failed = True
+            self.offer(e)
+            return
+        self.offer(None)
+
+    def offer(self, item) -> bool:
+        # timed put, so a stopped result does not keep its thread (and buffers) blocked
+        while not self.stopped:
+            try:
+                self.batches.put(item, timeout=OFFER_TIMEOUT)
+                return True
+            except Full:
+                pass
+        return False
+
+    def next_batch(self) -> bool:
+        if self.eof:
+            return False
+        batch = self.batches.get()
+        if batch is None or isinstance(batch, Exception):
+            self.eof = True
+            self.worker.join()
+            if batch is not None:
+                raise batch
+            return False
+        self.data = batch
+        self.data_len = len(batch)
         self.pos = 0
+        return True
 
     def fetchone(self) -> tuple:
-        if self.pos > len(self.data):
-            return None
+        while self.pos >= self.data_len:
+            if not self.next_batch():
+                return None
         self.pos += 1
         return self.data[self.pos - 1]
 
     def fetchmany(self, arraysize: int = -1) -> tuple:
         if arraysize <= 0:
             raise Exception("Wrong arraysize value {}", arraysize)
-        if self.pos > len(self.data):
+        res = []
+        while len(res) < arraysize:
+            if self.pos >= self.data_len and not self.next_batch():
+                break
+            end = min(self.data_len, self.pos + arraysize - len(res))
+            res.extend(self.data[self.pos:end])
+            self.pos = end
+        if len(res) == 0:
             return None
-        self.pos += arraysize
-        return self.data[self.pos - arraysize:self.pos]
+        return tuple(res)
 
     def fetchall(self) -> tuple:
-        return self.data
+        res = list(self.data[self.pos:])
+        while self.next_batch():
+            res.extend(self.data)
+        self.data = ()
+        self.data_len = 0
+        self.pos = 0
+        return tuple(res)
+
+    def __iter__(self):
+        while True:
+            data = self.data
+            while self.pos < self.data_len:
+                self.pos += 1
+                yield data[self.pos - 1]
+            if not self.next_batch():
+                return
+
+    def fetch_remaining(self) -> None:
+        # keep remaining rows in memory, so connection can read next responses
+        if not self.eof:
+            self.data = self.fetchall()
+            self.data_len = len(self.data)
+
+    def close(self) -> None:
+        # remaining rows are discarded: background thread is stopped, then remaining packets are skipped
+        # without decoding
+        if not self.eof:
+            self.stopped = True
+            self.worker.join()
+            self.eof = True
+            if not self.loaded and not self.failed:
+                end_max_length = 16777215 if self.context.eof_deprecated else 8
+                for buf in self.reader.packets():
+                    header = buf.buf[buf.pos]
+                    if header == 0xFF or (header == 0xFE and buf.readable_bytes() < end_max_length):
+                        self.read_row(buf)
+                        break
+        self.data = ()
+        self.data_len = 0
+        self.pos = 0
+        self.closed = True
+
+    def abort(self) -> None:
+        # connection is closed: background thread ends without waiting for consumer
+        self.stopped = True
+        self.eof = True
+        self.data = ()
+        self.data_len = 0
+        self.pos = 0
+        self.closed = True
+
+    def close_from_stmt_close(self, lock):
+        lock.acquire()
+        try:
+            self.close()
+        finally:
+            lock.release()
 
     def streaming(self) -> bool:
-        return False
+        return True
@@ -4,10 +4,13 @@ from mariadb.client.Context import Context
 from mariadb.client.PacketReader import PacketReader
 from mariadb.client.PacketWriter import PacketWriter
 from mariadb.client.result.CompleteResult import CompleteResult
+from mariadb.client.result.Result import row_builder
+from mariadb.client.result.StreamingResult import StreamingResult
 from mariadb.message.server.Column import Column
 from mariadb.message.server.ErrorPacket import ErrorPacket
 from mariadb.message.server.OkPacket import OkPacket
 from mariadb.util.ExceptionFactory import ExceptionFactory
+from mariadb.util.constant import ServerStatus
 
 
 class ClientMessage:
@@ -83,8 +86,10 @@ class ClientMessage:
 
             can_skip_meta = context.skip_meta and self.can_skip_meta()
             skip_meta = False if not can_skip_meta else buf.read_byte() == 0
+            parse_fcts = None
             if can_skip_meta and skip_meta:
                 ci = cursor.prepare.columns
+                parse_fcts = cursor.prepare.parsers()
             else:
                 # read columns information's
                 ci = [None] * field_count
@@ -93,26 +98,43 @@ class ClientMessage:
 
             if can_skip_meta and not skip_meta:
                 cursor.update_meta(ci)
+                parse_fcts = cursor.prepare.parsers()
 
             # intermediate EOF
             if not context.eof_deprecated:
                 reader.get_packet_from_socket()
 
+            row_factory = cursor.row_factory if cursor is not None else None
+            raw = cursor is not None and cursor.raw
+            if row_factory is None:
+                builder = tuple
+            elif parse_fcts is not None:
+                # same metadata than prepared statement
+                builder = cursor.prepare.row_builder(row_factory)
+            else:
+                builder = row_builder(row_factory, ci)
+
             # read resultSet
-            # if fetch_size != 0:
-            #     if (context.server_status & ServerStatus.MORE_RESULTS_EXISTS) > 0:
-            #         context.server_status = context.server_status - ServerStatus.MORE_RESULTS_EXISTS
-            #
-            #     return StreamingResult(
-            #         self.binary_protocol(),
-            #         ci,
-            #         reader,
-            #         context,
-            #         fetch_size,
-            #         lock)
-            # else:
+            if fetch_size != 0:
+                # following results will be read when this one is completely read
+                if (context.server_status & ServerStatus.MORE_RESULTS_EXISTS) > 0:
+                    context.server_status = context.server_status - ServerStatus.MORE_RESULTS_EXISTS
+
+                return StreamingResult(
+                    self.binary_protocol(),
+                    ci,
+                    reader,
+                    context,
+                    parse_fcts,
+                    builder,
+                    fetch_size,
+                    raw)
+
             return CompleteResult(
                 self.binary_protocol(),
                 ci,
                 reader,
-                context)
+                context,
+                parse_fcts,
+                builder,
+                raw)
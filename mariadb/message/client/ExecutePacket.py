@@ -1,29 +1,41 @@
+import mmap
 from datetime import datetime, date, time
 
 from mariadb.client.Context import Context
 from mariadb.client.DataType import DataType
+from mariadb.client.PacketReader import PacketReader
 from mariadb.client.PacketWriter import PacketWriter
 from mariadb.message.ClientMessage import ClientMessage
 from mariadb.message.client.LongDataPacket import LongDataPacket
+from mariadb.util.ExceptionFactory import ExceptionFactory, SQLError
 
 NO_CURSOR_AND_ITERATION = b'\x00\x01\x00\x00\x00'
+NULL_TYPE = DataType.NULL.value
 
 class ExecutePacket(ClientMessage):
-    __slots__ = ('statement_id', 'parameters', 'sql')
+    __slots__ = ('statement_id', 'parameters', 'sql', 'prepare', 'parameter_types')
 
-    def __init__(self, statement_id: int, parameters, sql: str):
+    def __init__(self, statement_id: int, parameters, sql: str, prepare=None):
         self.parameters = parameters
         self.statement_id = statement_id
         self.sql = sql
+        self.prepare = prepare
+        self.parameter_types = None
 
     def encode(self, writer: PacketWriter, context: Context) -> int:
 
         parameter_count = len(self.parameters)
 
-        # send long data value in separate packet
+        # send long data value in separate packet, small binary values are written inline
+        threshold = context.conf.get('long_data_threshold')
+        long_data = None
         for i, param in enumerate(self.parameters):
-            if param is not None and (type(param) is bytes or type(param) is bytearray or type(param) is memoryview):
-                LongDataPacket(self.statement_id, param, i).encode(writer, context)
+            if param is not None and is_long_data(param, threshold):
+                LongDataPacket(self.statement_id, param, i, context.conf.get('long_data_chunk_size')).encode(writer,
+                                                                                                          context)
+                if long_data is None:
+                    long_data = [False] * parameter_count
+                long_data[i] = True
 
         writer.init_packet()
         writer.write_byte(0x17)
@@ -33,32 +45,58 @@ class ExecutePacket(ClientMessage):
         if parameter_count > 0:
             # create null bitmap and reserve place in writer
             null_count = int((parameter_count + 7) / 8)
-            null_bits_buffer = bytes(null_count)
+            null_bits_buffer = bytearray(null_count)
             initial_pos = writer.pos
             writer.pos = initial_pos + null_count
 
-            # Send Parameter type flag
-            writer.write_byte(0x01)
-
-            # Store types of parameters in first package that is sent to the server.
+            parameter_types = [NULL_TYPE] * parameter_count
             for i, p in enumerate(self.parameters):
                 if p is None:
                     null_bits_buffer[int(i / 8)] |= (1 << (i % 8))
                 else:
-                    writer.write_byte(param_datatype(p).value)
+                    parameter_types[i] = param_datatype(p).value
+
+            if self.prepare is not None and self.prepare.parameter_types == parameter_types:
+                # same types than last execution: server keep bound types
+                writer.write_byte(0x00)
+            else:
+                # Send Parameter type flag
+                writer.write_byte(0x01)
+
+                # Store types of parameters in first package that is sent to the server.
+                for parameter_type in parameter_types:
+                    writer.write_byte(parameter_type)
                     writer.write_byte(0)
+                self.parameter_types = parameter_types
+                if self.prepare is not None:
+                    self.prepare.parameter_types = parameter_types
 
             # write nullBitsBuffer in reserved place
             writer.write_bytes_at_pos(null_bits_buffer, initial_pos)
 
             # send not null parameter, not long data
             for i, p in enumerate(self.parameters):
-                if p is None or type(p) is bytes or type(p) is bytearray or type(p) is memoryview:
+                if p is None or (long_data is not None and long_data[i]):
                     continue
                 write_param(writer, p)
         writer.flush()
         return 1
 
+    def read_msg_result(self, cursor, fetch_size: int, reader: PacketReader, writer: PacketWriter,
+                        context: Context, exception_factory: ExceptionFactory):
+        try:
+            res = super().read_msg_result(cursor, fetch_size, reader, writer, context, exception_factory)
+        except SQLError:
+            # types binding is unknown after an error, send them again next time
+            if self.prepare is not None:
+                self.prepare.parameter_types = None
+            raise
+        if self.prepare is None and self.parameter_types is not None and cursor is not None \
+                and cursor.prepare is not None:
+            # pipelined with prepare: statement is now known
+            cursor.prepare.parameter_types = self.parameter_types
+        return res
+
     def binary_protocol(self) -> bool:
         return True
 
@@ -126,7 +164,7 @@ def write_param(writer: PacketWriter, param) -> None:
             writer.write_byte(param.minute)
             writer.write_byte(param.second)
             writer.write_int(param.microsecond)
-    elif type(param) is bytes or type(param) is bytearray or type(param) is memoryview:
+    elif type(param) is bytes or type(param) is bytearray or type(param) is memoryview or type(param) is mmap.mmap:
         writer.write_length(len(param))
         writer.write_bytes(param, len(param))
     else:
@@ -151,6 +189,13 @@ def param_datatype(p) -> DataType:
         return DataType.DATE
     elif type(p) is time:
         return DataType.TIME
-    elif type(p) is bytes or type(p) is bytearray or type(p) is memoryview:
+    elif type(p) is bytes or type(p) is bytearray or type(p) is memoryview or hasattr(p, 'read'):
         return DataType.BLOB
     raise Exception('type ' + type(p) + ' is not supported')
+
+
+def is_long_data(p, threshold: int) -> bool:
+    # file-like objects and binary values of at least threshold bytes are sent with COM_STMT_SEND_LONG_DATA
+    if type(p) is bytes or type(p) is bytearray or type(p) is memoryview or type(p) is mmap.mmap:
+        return len(p) >= threshold
+    return type(p) is not str and hasattr(p, 'read')
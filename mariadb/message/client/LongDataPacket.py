@@ -1,19 +1,58 @@
+import mmap
+
 from mariadb.client.Context import Context
 from mariadb.client.PacketWriter import PacketWriter
 from mariadb.message.ClientMessage import ClientMessage
 
+# command byte + statement id + parameter index
+LONG_DATA_HEADER_LENGTH = 7
+
 
 class LongDataPacket(ClientMessage):
-    def __init__(self, statement_id: int, parameter, index: int):
+
+    __slots__ = ('statement_id', 'parameter', 'index', 'chunk_size')
+
+    def __init__(self, statement_id: int, parameter, index: int, chunk_size: int):
         self.statement_id = statement_id
         self.parameter = parameter
         self.index = index
+        self.chunk_size = chunk_size
 
     def encode(self, writer: PacketWriter, context: Context) -> int:
+        # each COM_STMT_SEND_LONG_DATA must fit in one packet, server append successive chunks of the same parameter
+        chunk_size = min(self.chunk_size, writer.max_packet_length - 4 - LONG_DATA_HEADER_LENGTH)
+
+        if type(self.parameter) is not mmap.mmap and hasattr(self.parameter, 'read'):
+            # file-like object: only one chunk is in memory at a time
+            sent = False
+            while True:
+                chunk = self.parameter.read(chunk_size)
+                if not chunk:
+                    break
+                self.write_chunk(writer, chunk)
+                sent = True
+            if not sent:
+                # empty stream, parameter must still be flagged as long data
+                self.write_chunk(writer, b'')
+            return 0
+
+        with memoryview(self.parameter) as view:
+            length = len(view)
+            off = 0
+            while True:
+                self.write_chunk(writer, view[off:off + chunk_size])
+                off += chunk_size
+                if off >= length:
+                    break
+        return 0
+
+    def write_chunk(self, writer: PacketWriter, chunk) -> None:
         writer.init_packet()
         writer.write_byte(0x18)
         writer.write_int(self.statement_id)
         writer.write_short(self.index)
-        writer.write_bytes(self.parameter, len(self.parameter))
+        writer.write_bytes(chunk, len(chunk))
         writer.flush()
-        return 0
+
+    def description(self) -> str:
+        return "SEND LONG DATA"
@@ -9,14 +9,18 @@ from mariadb.message.server.ErrorPacket import ErrorPacket
 from mariadb.message.server.PrepareResultPacket import PrepareResultPacket
 from mariadb.util.ExceptionFactory import ExceptionFactory
 
+# longer statements are not kept in prepare cache
+MAX_CACHED_SQL_LENGTH = 8192
+
 
 class PreparePacket(ClientMessage):
 
-    __slots__ = ('sql', 'client')
+    __slots__ = ('sql', 'client', 'use_cache')
 
-    def __init__(self, sql: str, client):
+    def __init__(self, sql: str, client, use_cache: bool = True):
         self.sql = sql
         self.client = client
+        self.use_cache = use_cache
 
     def encode(self, writer: PacketWriter, context: Context) -> int:
         sql_bytes = self.sql.encode()
@@ -40,13 +44,17 @@ class PreparePacket(ClientMessage):
             error_packet = ErrorPacket(buf, context)
             raise exception_factory.with_sql(self.description()).create(error_packet.message, error_packet.sql_state, error_packet.error_code)
 
-        if context.conf.get('use_binary') and context.conf.get('prep_stmt_cache_size') > 0 and len(self.sql) < 8192:
-            prepare = CachedPrepareResultPacket(buf, reader, context, self.client)
+        if self.use_cache and context.conf.get('use_binary') and context.conf.get('prep_stmt_cache_size') > 0 \
+                and len(self.sql) < MAX_CACHED_SQL_LENGTH:
+            prepare = CachedPrepareResultPacket(buf, reader, context, self.client, self.sql)
             previous_cached = context.prepare_cache.put(self.sql, prepare)
-            cursor.prepare = previous_cached if previous_cached is not None else prepare
+            if previous_cached is not None:
+                prepare = context.prepare_cache.get(self.sql)
         else:
-            cursor.prepare = PrepareResultPacket(buf, reader, context, self.client)
-        return cursor.prepare
+            prepare = PrepareResultPacket(buf, reader, context, self.client)
+        if cursor is not None:
+            cursor.prepare = prepare
+        return prepare
 
 
     def description(self) -> str:
@@ -41,6 +41,17 @@ QUOTE = ord('\'')
 COMA = ord(',')
 BINARY_PREFIX = b'_BINARY \''
 
+# parameter types encoded in text protocol (streams and others are only sent in binary protocol)
+TEXT_PARAM_TYPES = frozenset((bool, str, int, float, datetime, date, time, list, set, frozenset, bytes, bytearray,
+                              memoryview, dict))
+
+
+def text_encodable(params) -> bool:
+    for param in params:
+        if param is not None and type(param) not in TEXT_PARAM_TYPES:
+            return False
+    return True
+
 
 def write_param(writer: PacketWriter, param, no_backslash_escapes) -> None:
     if type(param) is bool:
@@ -66,17 +77,17 @@ def write_param(writer: PacketWriter, param, no_backslash_escapes) -> None:
         writer.write_ascii(param.isoformat())
         writer.write_byte(QUOTE)
     elif type(param) is list or type(param) is set or type(param) is frozenset:
-        for idx, p in param:
+        for idx, p in enumerate(param):
             if idx != 0:
                 writer.write_byte(COMA)
-            write_param(writer, p)
+            write_param(writer, p, no_backslash_escapes)
     elif type(param) is bytes or type(param) is bytearray or type(param) is memoryview:
         writer.write_bytes(BINARY_PREFIX, len(BINARY_PREFIX))
-        writer.write_bytes(param, len(param))
+        writer.write_bytes_escaped(param, len(param), no_backslash_escapes)
         writer.write_byte(QUOTE)
     elif type(param) is dict:
         writer.write_byte(QUOTE)
         writer.write_string_escaped(json.dumps(param), no_backslash_escapes)
         writer.write_byte(QUOTE)
     else:
-        raise Exception('type ' + type(param) + ' is not supported')
+        raise Exception('type {} is not supported'.format(type(param)))
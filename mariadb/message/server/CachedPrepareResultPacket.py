@@ -5,12 +5,18 @@ from mariadb.message.server.PrepareResultPacket import PrepareResultPacket
 
 class CachedPrepareResultPacket(PrepareResultPacket):
 
-    __slots__ = ('closing', 'cached')
+    __slots__ = ('closing', 'cached', 'sql')
 
-    def __init__(self, buffer: ReadableByteBuf, reader: PacketReader, context, client):
+    def __init__(self, buffer: ReadableByteBuf, reader: PacketReader, context, client, sql: str):
         super(CachedPrepareResultPacket, self).__init__(buffer, reader, context, client)
         self.closing = False
         self.cached = False
+        # prepare cache key
+        self.sql = sql
+
+    def update_meta(self, columns) -> None:
+        super(CachedPrepareResultPacket, self).update_meta(columns)
+        self.client.context.prepare_cache.resize(self.sql, self)
 
     def close(self, con) -> None:
         if not self.cached and not self.closing:
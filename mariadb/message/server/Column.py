@@ -1,17 +1,29 @@
 import json
 import struct
+from threading import Lock
 
-from mariadb.client import DataTypeMap
+from mariadb.client import Converters, DataTypeMap
 from mariadb.client.DataType import DataType
 from mariadb.client.ReadableByteBuf import ReadableByteBuf
 from mariadb.util.constant import ColumnFlags
 
 PARSER = struct.Struct("<HIBHB")
 
+# binary protocol types encoded with a fixed length, other values being length encoded
+BINARY_FIXED_TYPES = frozenset((DataType.TINYINT, DataType.SMALLINT, DataType.YEAR, DataType.INTEGER,
+                                DataType.MEDIUMINT, DataType.BIGINT, DataType.FLOAT, DataType.DOUBLE))
+
+# interned columns by raw column definition, shared by all results and connections
+COLUMN_CACHE_SIZE = 1024
+column_cache = {}
+column_cache_lock = Lock()
+
+
 class Column:
-    __slots__ = ('data_type', 'saved', 'charset', 'length', 'decimals', 'flags', 'ext_type_name')
+    __slots__ = ('data_type', 'saved', 'charset', 'length', 'decimals', 'flags', 'ext_type_name', 'column_name',
+                 'column_description', 'text_parser', 'binary_parser', 'parser_generation')
 
-    def __init__(self, saved: bytearray, length: int, data_type: DataType, charset: int,
+    def __init__(self, saved: bytes, length: int, data_type: DataType, charset: int,
                  decimals: int, flags: int, ext_type_name: str):
         self.data_type = data_type
         self.saved = saved
@@ -20,11 +32,21 @@ class Column:
         self.decimals = decimals
         self.flags = flags
         self.ext_type_name = ext_type_name
+        # decoded on first use
+        self.column_name = None
+        self.column_description = None
+        self.text_parser = None
+        self.binary_parser = None
+        self.parser_generation = 0
 
     @staticmethod
     def decode(buf: ReadableByteBuf, extended_info: bool):
 
         saved = buf.save_buf()
+        column = column_cache.get(saved)
+        if column is not None:
+            # same column definition already parsed
+            return column
 
         ext_type_name = None
         # if extended_info:
@@ -46,7 +68,31 @@ class Column:
         data_type = DataTypeMap.type_map[data_type_val]
 
         # str_buf = buf.buf[0:string_pos[4]]
-        return Column(saved, length, data_type, charset, decimals, flags, ext_type_name)
+        column = Column(saved, length, data_type, charset, decimals, flags, ext_type_name)
+        with column_cache_lock:
+            if len(column_cache) >= COLUMN_CACHE_SIZE:
+                # evict oldest entry
+                column_cache.pop(next(iter(column_cache)), None)
+            column_cache[saved] = column
+        return column
+
+    def get_name(self) -> str:
+        if self.column_name is None:
+            buf = ReadableByteBuf(self.saved, 0, len(self.saved))
+            for i in range(4):
+                # skip catalog, schema, table alias and table
+                buf.skip(buf.read_length_not_null())
+            self.column_name = buf.read_string(buf.read_length_not_null())
+        return self.column_name
+
+    def description(self) -> tuple:
+        """
+        DB-API column description: name, type_code, display_size, internal_size, precision, scale, null_ok
+        """
+        if self.column_description is None:
+            self.column_description = (self.get_name(), self.data_type.value, self.get_display_size(), self.length,
+                                       self.get_precision(), self.decimals, (self.flags & ColumnFlags.NOT_NULL) == 0)
+        return self.column_description
 
     def is_signed(self) -> bool:
         return (self.flags & ColumnFlags.UNSIGNED) == 0
@@ -84,7 +130,42 @@ class Column:
             return self.length
 
     def parser(self, binary: bool):
-        print(f"type:{self.data_type} self.is_signed():{self.is_signed()}")
+        # parsers are memoized, column being shared by results with the same definition
+        if self.parser_generation != Converters.generation:
+            # converters changed since parsers were built
+            self.text_parser = None
+            self.binary_parser = None
+            self.parser_generation = Converters.generation
+        if binary:
+            if self.binary_parser is None:
+                self.binary_parser = self.create_parser(True)
+            return self.binary_parser
+        if self.text_parser is None:
+            self.text_parser = self.create_parser(False)
+        return self.text_parser
+
+    def create_parser(self, binary: bool):
+        converter = Converters.find_converter(self)
+        if converter is None:
+            return self.default_parser(binary)
+        if binary and (self.data_type == DataType.TIMESTAMP or self.data_type == DataType.DATETIME):
+            decimals = self.decimals
+            return lambda buf: converter(buf.read_datetime_text(decimals))
+        if binary and (self.data_type == DataType.DATE or self.data_type == DataType.NEWDATE):
+            return lambda buf: converter(buf.read_date_text())
+        if binary and self.data_type == DataType.TIME:
+            decimals = self.decimals
+            return lambda buf: converter(buf.read_time_text(decimals))
+        if binary and self.data_type in BINARY_FIXED_TYPES:
+            default_parser = self.default_parser(True)
+            return lambda buf: converter(default_parser(buf))
+
+        def convert(buf):
+            value = buf.read_bytes_length_encoded()
+            return None if value is None else converter(value)
+        return convert
+
+    def default_parser(self, binary: bool):
         if binary:
             if self.data_type == DataType.TINYINT:
                 if self.is_signed():
@@ -106,7 +187,7 @@ class Column:
                 return lambda buf: buf.read_float()
             if self.data_type == DataType.DOUBLE:
                 return lambda buf: buf.read_double()
-            if self.data_type == DataType.TIMESTAMP or self.data_type == DataType.TIMESTAMP:
+            if self.data_type == DataType.TIMESTAMP or self.data_type == DataType.DATETIME:
                 return lambda buf: buf.read_datetime()
             if self.data_type == DataType.DATE or self.data_type == DataType.NEWDATE:
                 return lambda buf: buf.read_date()
@@ -130,7 +211,7 @@ class Column:
         if self.ext_type_name == 'json' or self.data_type == DataType.JSON:
             return lambda buf: json.loads(buf.read_string_length_encoded())
         if self.charset == 63:
-            return lambda buf: buf.read_length_buffer()
+            return lambda buf: buf.read_bytes_length_encoded()
         if self.flags & 2048 > 0:
             return lambda buf: buf.read_set_length_encoded()
         return lambda buf: buf.read_string_length_encoded()
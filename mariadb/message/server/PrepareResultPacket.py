@@ -1,7 +1,9 @@
 import struct
 
+from mariadb.client import Converters
 from mariadb.client.PacketReader import PacketReader
 from mariadb.client.ReadableByteBuf import ReadableByteBuf
+from mariadb.client.result.Result import row_builder
 from mariadb.message.server.Column import Column
 from mariadb.util.constant import Capabilities
 
@@ -9,11 +11,19 @@ PARSER = struct.Struct("<IHH")
 
 class PrepareResultPacket:
 
-    __slots__ = ('client', 'statement_id', 'num_params', 'columns')
+    __slots__ = ('client', 'statement_id', 'num_params', 'columns', 'parameter_types', 'decoders', 'decoders_generation',
+                 'builders')
 
     def __init__(self, buffer: ReadableByteBuf, reader: PacketReader, context, client):
         buffer.read_byte()
         self.client = client
+        # parameter types bound by last execution
+        self.parameter_types = None
+        # binary decoder plan of columns, built on first use
+        self.decoders = None
+        self.decoders_generation = 0
+        # row builders by row factory, built on first use
+        self.builders = None
         self.statement_id, num_columns, self.num_params = PARSER.unpack_from(buffer.buf, buffer.pos)
         parameters = [None] * self.num_params
         self.columns = [None] * num_columns
@@ -31,6 +41,27 @@ class PrepareResultPacket:
         if not context.eof_deprecated:
             reader.get_packet_from_socket()
 
+    def update_meta(self, columns) -> None:
+        self.columns = columns
+        self.decoders = None
+        self.builders = None
+
+    def parsers(self) -> list:
+        if self.decoders is None or self.decoders_generation != Converters.generation:
+            # (re)built when converters changed
+            self.decoders_generation = Converters.generation
+            self.decoders = [col.parser(True) for col in self.columns]
+        return self.decoders
+
+    def row_builder(self, row_factory):
+        if self.builders is None:
+            self.builders = {}
+        builder = self.builders.get(row_factory)
+        if builder is None:
+            builder = row_builder(row_factory, self.columns)
+            self.builders[row_factory] = builder
+        return builder
+
     def close(self, con) -> None:
         con.close_prepare(self)
 
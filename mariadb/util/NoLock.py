@@ -0,0 +1,18 @@
+class NoLock:
+    """
+    Lock of connections not shared between threads (thread_safe=False): acquire and release do nothing
+    """
+
+    __slots__ = ()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+    def __enter__(self):
+        return True
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3 -O
+# -*- coding: utf-8 -*-
+
+# allocation benchmark, using tracemalloc (no additional requirement)
+
+import importlib
+
+from benchmarks.memory_bench import memory_suite
+from benchmarks.memory_bench import run_memory_test
+from test.conf_test import conf, glob
+
+
+module = glob()
+dbdrv = importlib.import_module(module["module"])
+
+
+def main():
+    default_conf = conf()
+    conn = dbdrv.connect(**default_conf)
+    run_memory_test(memory_suite(), conn)
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3 -O
+# -*- coding: utf-8 -*-
+
+# multi-threaded stress benchmark: N threads on N connections (no additional requirement)
+
+import importlib
+
+from benchmarks.thread_bench import thread_suite
+from benchmarks.thread_bench import run_thread_test
+from test.conf_test import conf, glob
+
+
+module = glob()
+dbdrv = importlib.import_module(module["module"])
+
+
+def main():
+    default_conf = conf()
+    run_thread_test(thread_suite(), lambda: dbdrv.connect(**default_conf))
+
+if __name__ == "__main__":
+    main()
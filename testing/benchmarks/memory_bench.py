@@ -0,0 +1,96 @@
+#!/usr/bin/env python3 -O
+# -*- coding: utf-8 -*-
+
+import gc
+import sys
+import tracemalloc
+
+
+def num_fetchall(loops, conn):
+    cursor = conn.cursor()
+    for value in range(loops):
+        cursor.execute('select col1,col2,col3,col4,col5 from num_test')
+        row = cursor.fetchall()
+        del row
+    del cursor
+
+
+def str_fetchloop(loops, conn):
+    cursor = conn.cursor()
+    for value in range(loops):
+        cursor.execute('select col1,col2,col3 from str_test')
+        row = cursor.fetchone()
+        while row is not None:
+            row = cursor.fetchone()
+    del cursor
+
+
+def select_1(loops, conn):
+    cursor = conn.cursor()
+    for value in range(loops):
+        cursor.execute("select 1")
+        row = cursor.fetchall()
+    cursor.close()
+
+
+def select_1_blocks(loops, conn):
+    """
+    Allocated blocks kept by each 'select 1' result, and transient memory of one execution,
+    averaged over loops (only meaningful when run with tracemalloc started).
+    """
+    cursor = conn.cursor()
+    if not tracemalloc.is_tracing():
+        # warmup
+        select_1(loops, conn)
+        return
+    rows = [None] * loops
+    peak = 0
+    # transient memory needs tracemalloc.reset_peak (python 3.9+)
+    measure_peak = hasattr(tracemalloc, 'reset_peak')
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for value in range(loops):
+        if measure_peak:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        cursor.execute("select 1")
+        # results are kept, so blocks they allocated are counted
+        rows[value] = cursor.fetchall()
+        if measure_peak:
+            peak += tracemalloc.get_traced_memory()[1] - before
+    blocks = sys.getallocatedblocks() - blocks
+    del rows
+    cursor.close()
+    if loops > 0 and measure_peak:
+        print("%-50s %.1f allocated blocks per result, %d B transient memory per execution"
+              % ('select 1 blocks', blocks / loops, peak // loops))
+    elif loops > 0:
+        print("%-50s %.1f allocated blocks per result" % ('select 1 blocks', blocks / loops))
+
+
+def memory_suite():
+    return [
+        {'label': '1000 rows * 5 numeric col using fetchall', 'method': num_fetchall, 'loops': 20},
+        {'label': '100 rows * 3 col utf8 string using fetchone', 'method': str_fetchloop, 'loops': 20},
+        {'label': 'select 1', 'method': select_1, 'loops': 1000},
+        {'label': 'select 1 allocated blocks', 'method': select_1_blocks, 'loops': 1000},
+    ]
+
+
+def run_memory_test(tests, conn):
+    """
+    Run each test with tracemalloc enabled, reporting peak traced memory,
+    memory still allocated after the run, and number of young generation collections.
+    """
+    for test in tests:
+        # warmup: fill prepare cache, read-ahead buffer, ...
+        test['method'](1, conn)
+        gc.collect()
+        collections = gc.get_stats()[0]['collections']
+        tracemalloc.start()
+        test['method'](test['loops'], conn)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        collections = gc.get_stats()[0]['collections'] - collections
+        print("%-50s peak: %10d B  retained: %8d B  gen0 collections: %d"
+              % (test['label'], peak, current, collections))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3 -O
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import time
+
+
+def select_1_worker(conn, duration, counts, index, barrier):
+    cursor = conn.cursor()
+    barrier.wait()
+    count = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        cursor.execute("select 1")
+        cursor.fetchall()
+        count += 1
+    counts[index] = count
+    cursor.close()
+
+
+def num_fetchall_worker(conn, duration, counts, index, barrier):
+    cursor = conn.cursor()
+    barrier.wait()
+    count = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        cursor.execute('select col1,col2,col3,col4,col5 from num_test')
+        cursor.fetchall()
+        count += 1
+    counts[index] = count
+    cursor.close()
+
+
+def thread_suite():
+    return [
+        {'label': 'select 1', 'method': select_1_worker},
+        {'label': '1000 rows * 5 numeric col using fetchall', 'method': num_fetchall_worker},
+    ]
+
+
+def run_thread_test(tests, connect, thread_counts=(1, 2, 4, 8), duration=2.0):
+    """
+    Run each test with N threads, each one using its own connection, and report throughput
+    and scaling relative to one thread.
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print("GIL enabled: %s" % gil)
+    for test in tests:
+        base = None
+        for thread_count in thread_counts:
+            conns = [connect() for i in range(thread_count)]
+            counts = [0] * thread_count
+            barrier = threading.Barrier(thread_count)
+            threads = [threading.Thread(target=test['method'], args=(conns[i], duration, counts, i, barrier))
+                       for i in range(thread_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for conn in conns:
+                conn.close()
+            ops = sum(counts) / duration
+            if base is None:
+                base = ops
+            print("%-50s threads: %2d  %10.0f ops/s  scaling: %.2fx"
+                  % (test['label'], thread_count, ops, ops / base if base else 0))
@@ -245,6 +245,78 @@ class TestConnection(unittest.TestCase):
         self.assertEqual(newstr, '\\"' * 4194304)
         c1.close()
 
+    def test_prepare(self):
+        with self.connection.prepare("SELECT ?, ?") as stmt:
+            for i in range(3):
+                stmt.execute((i, "a"))
+                self.assertEqual(stmt.fetchall(), ((i, "a"),))
+            stmt.execute((None, "b"))
+            self.assertEqual(stmt.fetchone(), (None, "b"))
+
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TEMPORARY TABLE test_prepare (a int, b varchar(10))")
+        with self.connection.prepare("INSERT INTO test_prepare VALUES (?, ?)") as stmt:
+            stmt.executemany([(1, "a"), (2, "b")])
+            stmt.executemany([])
+            self.assertEqual(stmt.rowcount, -1)
+            stmt.execute((3, "c"))
+        cursor.execute("SELECT * FROM test_prepare ORDER BY a")
+        self.assertEqual(cursor.fetchall(), ((1, "a"), (2, "b"), (3, "c")))
+
+        # dropped statement is closed on server with next command
+        stmt = self.connection.prepare("SELECT ?")
+        del stmt
+        cursor.execute("SELECT 1")
+        self.assertEqual(cursor.fetchall(), ((1,),))
+        del cursor
+
+    def test_prepare_parameter_types(self):
+        values = [(1,), ("a",), (None,), (b"x",), (2,), ("b",), (b"y",), (None,), (3,)]
+        with self.connection.prepare("SELECT ?") as stmt:
+            for value in values:
+                stmt.execute(value)
+                self.assertEqual(stmt.fetchall(), (value,))
+        cursor = self.connection.cursor()
+        for value in values:
+            cursor.execute("SELECT ?", value)
+            self.assertEqual(cursor.fetchall(), (value,))
+        del cursor
+
+    def test_prepare_on_connect(self):
+        self.assertRaises(mariadb.SQLError, create_connection, {"prepare_on_connect": "SELECT ?"})
+        connection = create_connection({"prepare_on_connect": ["SELECT ?", "SELECT * FROM unknown_table"]})
+        cursor = connection.cursor()
+        cursor.execute("SELECT ?", (1,))
+        self.assertEqual(cursor.fetchall(), ((1,),))
+        del cursor
+        connection.close()
+
+    def test_prepare_cache_stats(self):
+        connection = create_connection({"prepare_threshold": 2})
+        cursor = connection.cursor()
+        for i in range(4):
+            cursor.execute("SELECT ?", (i,))
+            cursor.fetchall()
+        stats = connection.prepare_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 1, 1))
+        self.assertEqual(connection.prepare_cache_hottest(1), [("SELECT ?", 2)])
+        del cursor
+        connection.close()
+
+    def test_not_thread_safe(self):
+        connection = create_connection({"thread_safe": False})
+        self.assertIsInstance(connection.lock, mariadb.NoLock)
+        cursor = connection.cursor()
+        cursor.execute("SELECT ?", (1,))
+        self.assertEqual(cursor.fetchall(), ((1,),))
+        cursor.execute("SELECT 2 UNION SELECT 3")
+        self.assertEqual(cursor.fetchall(), ((2,), (3,)))
+        connection.autocommit = False
+        connection.commit()
+        self.assertTrue(connection.is_valid())
+        del cursor
+        connection.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import io
+import mmap
 import decimal
 import json
 import os
+import pickle
+import sys
 import unittest
 from decimal import Decimal
 
@@ -70,6 +74,20 @@ class TestCursor(unittest.TestCase):
         self.assertEqual(row[3], c4)
         cursor.close()
 
+    def test_time_range(self):
+        values = ('-01:00:00', '838:59:59', '10:11:12', '25:00:00', '99:59:59.5')
+        expected = (datetime.timedelta(hours=-1), datetime.timedelta(hours=838, minutes=59, seconds=59),
+                    datetime.time(10, 11, 12), datetime.timedelta(hours=25),
+                    datetime.timedelta(hours=99, minutes=59, seconds=59, microseconds=500000))
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT CAST('-01:00:00' AS TIME), CAST('838:59:59' AS TIME), CAST('10:11:12' AS TIME), "
+                       "CAST('25:00:00' AS TIME), CAST('99:59:59.5' AS TIME(1))")
+        self.assertEqual(cursor.fetchone(), expected)
+        cursor.execute("SELECT CAST(? AS TIME), CAST(? AS TIME), CAST(? AS TIME), CAST(? AS TIME), "
+                       "CAST(? AS TIME(1))", values)
+        self.assertEqual(cursor.fetchone(), expected)
+        del cursor
+
     def test_numbers(self):
         cursor = self.connection.cursor()
         cursor.execute(
@@ -140,6 +158,35 @@ class TestCursor(unittest.TestCase):
         self.assertEqual(row[3], c4)
         del cursor
 
+    def test_blob_stream(self):
+        connection = create_connection({"long_data_chunk_size": 4096})
+        cursor = connection.cursor()
+        cursor.execute("CREATE TEMPORARY TABLE test_blob_stream (a longblob, b longblob)")
+
+        c1 = b'a' * 100000
+        c2 = b'b' * 10000
+        with mmap.mmap(-1, len(c2)) as m:
+            m[:] = c2
+            cursor.execute("INSERT INTO test_blob_stream VALUES (?,?)", (io.BytesIO(c1), m))
+
+        cursor.execute("SELECT * FROM test_blob_stream")
+        row = cursor.fetchone()
+        self.assertEqual(row[0], c1)
+        self.assertEqual(row[1], c2)
+        del cursor, connection
+
+    def test_prepare_threshold(self):
+        connection = create_connection({"prepare_threshold": 2})
+        cursor = connection.cursor()
+        values = [b"a' OR '1'='1", b"b\\'\"\0", io.BytesIO(b"c'd"), b"e'"]
+        for value in values:
+            cursor.execute("SELECT ?", (value,))
+            self.assertEqual(cursor.fetchone()[0], value.getvalue() if type(value) is io.BytesIO else value)
+        del cursor, connection
+
+    def test_long_data_chunk_size(self):
+        self.assertRaises(mariadb.SQLError, create_connection, {"long_data_chunk_size": 0})
+
     def test_inserttuple(self):
         if os.environ.get("MAXSCALE_VERSION"):
             self.skipTest("MAXSCALE doesn't support BULK yet")
@@ -228,6 +275,64 @@ class TestCursor(unittest.TestCase):
         self.assertEqual(row[0], 2)
         del cursor
 
+    def test_prefetch(self):
+        cursor = self.connection.cursor(prefetch=True)
+        cursor.arraysize = 100
+        cursor.execute("SELECT seq, 'a' FROM seq_1_to_1000")
+        self.assertEqual(cursor.fetchone(), (1, 'a'))
+        self.assertEqual(len(cursor.fetchmany(250)), 250)
+        rows = [row for row in cursor]
+        self.assertEqual(len(rows), 749)
+        self.assertEqual(rows[-1], (1000, 'a'))
+
+        # other command while result is not completely read
+        cursor.execute("SELECT seq FROM seq_1_to_1000")
+        cursor2 = self.connection.cursor()
+        cursor2.execute("SELECT 1")
+        self.assertEqual(cursor2.fetchall(), ((1,),))
+        self.assertEqual(len(cursor.fetchall()), 1000)
+
+        # close while batches are pending: remaining rows are skipped
+        cursor.execute("SELECT seq FROM seq_1_to_10000")
+        self.assertEqual(cursor.fetchone(), (1,))
+        cursor.close()
+        cursor2.execute("SELECT 2")
+        self.assertEqual(cursor2.fetchall(), ((2,),))
+
+        del cursor, cursor2
+
+    def test_decode_processes(self):
+        sql = "SELECT seq, IF(seq % 3, NULL, CONCAT('v', seq)), DATE('2020-01-01') + INTERVAL seq DAY FROM seq_1_to_1500"
+        cursor = self.connection.cursor()
+        cursor.execute(sql)
+        expected = cursor.fetchall()
+        del cursor
+        connection = create_connection({"decode_processes": 2, "decode_chunk_rows": 100})
+        cursor = connection.cursor()
+        cursor.execute(sql)
+        self.assertEqual(cursor.fetchall(), expected)
+        del cursor, connection
+
+    @unittest.skipIf(sys.version_info < (3, 8), "shared memory requires python 3.8")
+    def test_fetchall_shared(self):
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT seq, IF(seq % 2, NULL, CONCAT('v', seq)), seq / 2 FROM seq_1_to_100")
+        shared = cursor.fetchall_shared()
+        try:
+            self.assertEqual(shared.row_count, 100)
+            self.assertEqual(list(shared.column(0)), list(range(1, 101)))
+            self.assertEqual(shared.value(0, 1), None)
+            self.assertEqual(shared.value(1, 1), 'v2')
+            restored = pickle.loads(pickle.dumps(shared))
+            self.assertEqual(list(restored.rows())[3], (4, 'v4', 2.0))
+            restored.close()
+        finally:
+            shared.unlink()
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT 1")
+        self.assertRaises(mariadb.SQLError, cursor.fetchall_shared)
+        del cursor
+
     def test_buffered(self):
         cursor = self.connection.cursor(buffered=True)
         cursor.execute("SELECT 1 UNION SELECT 2 UNION SELECT 3")
@@ -345,6 +450,114 @@ class TestCursor(unittest.TestCase):
         self.assertEqual(row.city, "Boston")
         del cursor
 
+    def test_row_factory(self):
+        class Row:
+            __slots__ = ('a', 'b')
+
+            def __init__(self, a, b):
+                self.a = a
+                self.b = b
+
+        cursor = self.connection.cursor(row_factory=Row)
+        cursor.execute("SELECT 1 as a, 'x' as b UNION SELECT 2, 'y'")
+        rows = cursor.fetchall()
+        self.assertEqual([(row.a, row.b) for row in rows], [(1, 'x'), (2, 'y')])
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT ? as a, ? as b", (1, 'x'))
+        self.assertEqual(cursor.fetchone(), {'a': 1, 'b': 'x'})
+        del cursor
+
+    def test_column_lookup(self):
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT 1 as id, 'x' as Name")
+        self.assertEqual([col[0] for col in cursor.description], ['id', 'Name'])
+        self.assertEqual(cursor.column_index('name'), 1)
+        self.assertEqual(cursor.column_index('id'), 0)
+        self.assertRaises(mariadb.SQLError, cursor.column_index, 'unknown')
+        del cursor
+
+    def test_intern_values(self):
+        connection = create_connection({"intern_values": True})
+        cursor = connection.cursor()
+        cursor.execute("CREATE TEMPORARY TABLE test_intern_values (a enum('on', 'off'), b set('x', 'y'))")
+        cursor.executemany("INSERT INTO test_intern_values VALUES (?, ?)", [('on', 'x,y'), ('on', 'x,y'), ('off', '')])
+        cursor.execute("SELECT * FROM test_intern_values")
+        rows = cursor.fetchall()
+        self.assertIs(rows[0][0], rows[1][0])
+        self.assertEqual(rows[0][1], frozenset(('x', 'y')))
+        self.assertIs(rows[0][1], rows[1][1])
+        self.assertEqual(rows[2], ('off', frozenset()))
+        del cursor, connection
+
+    def test_temporal_cache(self):
+        connection = create_connection({"temporal_cache_size": 16})
+        cursor = connection.cursor()
+        cursor.execute("SELECT CAST('2020-01-02 03:04:05.12' AS DATETIME(2)), DATE('2021-02-03'), "
+                       "CAST('-01:00:00' AS TIME), CAST('10:11:12' AS TIME) UNION ALL "
+                       "SELECT CAST('2020-01-02 03:04:05.12' AS DATETIME(2)), NULL, NULL, NULL")
+        rows = cursor.fetchall()
+        self.assertEqual(rows[0], (datetime.datetime(2020, 1, 2, 3, 4, 5, 120000), datetime.date(2021, 2, 3),
+                                   datetime.timedelta(hours=-1), datetime.time(10, 11, 12)))
+        self.assertIs(rows[0][0], rows[1][0])
+        self.assertEqual(rows[1][1:], (None, None, None))
+        del cursor, connection
+
+    def test_converter(self):
+        mariadb.register_converter(mariadb.DataType.DECIMAL, lambda raw: Decimal(raw.decode('ascii')))
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT CAST(1.25 AS DECIMAL(5,2)), NULL")
+            self.assertEqual(cursor.fetchone(), (Decimal('1.25'), None))
+            cursor.execute("SELECT CAST(? AS DECIMAL(5,2))", (2,))
+            self.assertEqual(cursor.fetchone(), (Decimal('2.00'),))
+            del cursor
+        finally:
+            mariadb.unregister_converter(mariadb.DataType.DECIMAL)
+
+    def test_converter_with_options(self):
+        mariadb.register_converter(mariadb.DataType.STRING, bytes, flags=2048)
+        mariadb.register_converter(mariadb.DataType.DATE, bytes)
+        try:
+            for options in ({"intern_values": True}, {"temporal_cache_size": 16}):
+                connection = create_connection(options)
+                cursor = connection.cursor()
+                cursor.execute("CREATE TEMPORARY TABLE test_converter_options (a set('x', 'y'), b date)")
+                cursor.execute("INSERT INTO test_converter_options VALUES ('x,y', '2021-02-03')")
+                cursor.execute("SELECT * FROM test_converter_options")
+                self.assertEqual(cursor.fetchone(), (b'x,y', b'2021-02-03'))
+                del cursor, connection
+            # binary protocol temporal values are received as text protocol ones
+            mariadb.register_converter(mariadb.DataType.TIME, bytes)
+            with self.connection.prepare("SELECT CAST(? AS DATE), CAST(? AS TIME(1))") as stmt:
+                stmt.execute(('2021-02-03', '-25:00:00.5'))
+                self.assertEqual(stmt.fetchone(), (b'2021-02-03', b'-25:00:00.5'))
+        finally:
+            mariadb.unregister_converter(mariadb.DataType.STRING, flags=2048)
+            mariadb.unregister_converter(mariadb.DataType.DATE)
+            mariadb.unregister_converter(mariadb.DataType.TIME)
+
+    def test_raw(self):
+        cursor = self.connection.cursor(raw=True)
+        cursor.execute("SELECT 'abc', NULL, 12")
+        row = cursor.fetchone()
+        self.assertEqual(type(row[0]), memoryview)
+        self.assertEqual(bytes(row[0]), b'abc')
+        self.assertIsNone(row[1])
+        self.assertEqual(bytes(row[2]), b'12')
+        del cursor
+
+    def test_result_arena(self):
+        connection = create_connection({"result_arena": True})
+        cursor = connection.cursor()
+        cursor.execute("SELECT CAST(REPEAT('a', 100000) AS BINARY), CAST('abc' AS BINARY), 'abc', NULL")
+        row = cursor.fetchone()
+        self.assertEqual(type(row[0]), memoryview)
+        self.assertEqual(bytes(row[0]), b'a' * 100000)
+        self.assertEqual(bytes(row[1]), b'abc')
+        self.assertEqual(row[2:], ('abc', None))
+        del cursor, connection
+
     def test_laststatement(self):
         if os.environ.get("MAXSCALE_VERSION"):
             self.skipTest("MAXSCALE doesn't support BULK yet")